@@ -1,601 +1,472 @@
 import numpy as np
 import wave
 import struct
-import math
 import os
-
-# Create sounds directory if it doesn't exist
-os.makedirs('sounds', exist_ok=True)
-
-def create_sound(filename, frequency, duration, volume=0.5, sample_rate=44100):
-    """Create a simple sine wave sound"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-    wave_data = np.sin(2 * np.pi * frequency * t)
-
-    # Apply volume
-    wave_data = wave_data * volume
-
-    # Convert to 16-bit integer values
-    wave_data = (wave_data * 32767).astype(np.int16)
-
-    # Create WAV file
+import sys
+import json
+import hashlib
+import inspect
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+import synth
+from synth import Patch, Osc, FM, Line, Time, Exp, Fade, Burst, Noise, Clip, Sequence
+
+SAMPLE_RATE = 44100
+
+# numpy sample types for the pygame.mixer size values
+PCM_DTYPES = {8: np.uint8, -8: np.int8, 16: np.uint16, -16: np.int16, 32: np.float32, -32: np.float32}
+
+def encode_pcm(samples, size=-16, channels=1):
+    """Encode float samples as interleaved PCM in a mixer format from pygame.mixer.get_init()"""
+    dtype = PCM_DTYPES[size]
+    if abs(size) == 32:  # 32-bit mixers are float
+        scaled = samples
+    else:
+        bits = abs(size)
+        scaled = samples * (2 ** (bits - 1) - 1)
+        if size > 0:
+            scaled = scaled + 2 ** (bits - 1)  # Unsigned formats are offset by half range
+    # One allocation in the final layout; each channel is a broadcast copy
+    frames = np.empty((len(samples), channels), dtype=dtype)
+    frames[:] = scaled.astype(dtype)[:, None]
+    return frames
+
+def write_wav(filename, samples, sample_rate=SAMPLE_RATE):
+    """Write float samples as a mono 16-bit WAV file"""
     with wave.open(filename, 'wb') as wav_file:
         wav_file.setnchannels(1)  # Mono
         wav_file.setsampwidth(2)  # 2 bytes per sample
         wav_file.setframerate(sample_rate)
-        wav_file.writeframes(wave_data.tobytes())
-
-def create_laser_sound(filename, duration=0.1, volume=0.3, sample_rate=44100):
-    """Create a laser-like sound with descending pitch"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-
-    # Create descending frequency
-    freq_start = 1000
-    freq_end = 200
-    freq = np.linspace(freq_start, freq_end, len(t))
-
-    wave_data = np.sin(2 * np.pi * freq * t)
+        wav_file.writeframes(encode_pcm(samples).tobytes())
 
-    # Apply envelope
-    envelope = np.exp(-3 * t/duration)
-    wave_data = wave_data * envelope
+def read_wav(filename):
+    """Float samples and sample rate of a WAV written by write_wav.
 
-    # Normalize and apply volume
-    wave_data = wave_data / np.max(np.abs(wave_data)) * volume
+    Scaled back exactly as encode_pcm scaled them, so encoding the result to
+    16 bits again gives identical PCM.
+    """
+    with wave.open(filename, 'rb') as wav_file:
+        pcm = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+        return pcm / (2 ** 15 - 1), wav_file.getframerate()
 
-    # Convert to 16-bit integer values
-    wave_data = (wave_data * 32767).astype(np.int16)
-
-    # Create WAV file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(wave_data.tobytes())
+def laser_patch(duration=0.1, volume=0.3):
+    """Create a laser-like sound with descending pitch"""
+    return Patch(duration, Osc(Line(1000, 200)) * Exp(3 / duration),
+                 peak=volume, endpoint=True)
 
-def create_spread_laser_sound(filename, volume=0.4):
+def spread_laser_patch(volume=0.4):
     """Create a clean laser sound for spread weapon"""
-    duration = 0.30  # shorter duration
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-
-    # Simple laser with slight pitch rise
-    base_freq = 600
-    freq = base_freq * (-1 + t * 0.8)  # Slight pitch rise
-
-    # Main tone
-    audio = np.sin(2 * np.pi * freq * t)
-
-    # Apply envelope
-    envelope = np.exp(-t * 20)  # Quick decay
-    audio = audio * envelope
+    # Simple laser with slight pitch rise and quick decay
+    freq = 600 * (-1 + Time() * 0.8)
+    return Patch(0.30, Osc(freq) * Exp(20), peak=volume, clip=True)
 
-    # Normalize and apply volume
-    audio = audio / np.max(np.abs(audio)) * volume
-
-    # Normalize and convert to 16-bit integer
-    audio = np.clip(audio, -1, 1)
-    audio = np.int16(audio * 32767)
-
-    # Save to file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
-
-def create_power_up_sound(filename, duration=0.4, volume=0.4, sample_rate=44100):
+def power_up_patch(duration=0.4, volume=0.4):
     """Create a power-up sound"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-
-    # Create ascending frequency
-    freq_start = 500
-    freq_end = 1200
-    freq = np.linspace(freq_start, freq_end, len(t))
-
-    wave_data = np.sin(2 * np.pi * freq * t)
-
-    # Apply envelope
-    envelope = np.exp(-2 * t/duration)
-    wave_data = wave_data * envelope
-
-    # Normalize and apply volume
-    wave_data = wave_data / np.max(np.abs(wave_data)) * volume
-
-    # Convert to 16-bit integer values
-    wave_data = (wave_data * 32767).astype(np.int16)
-
-    # Create WAV file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(wave_data.tobytes())
+    return Patch(duration, Osc(Line(500, 1200)) * Exp(2 / duration),
+                 peak=volume, endpoint=True)
 
-def create_enemy_death_sound(filename, duration=0.2, volume=0.4, sample_rate=44100):
+def enemy_death_patch(duration=0.2, volume=0.4):
     """Create an explosion sound"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
+    # Noise-based explosion with some low frequency rumble
+    return Patch(duration, (Noise(1.0) + Osc(50)) * Exp(10 / duration),
+                 peak=volume, endpoint=True, seed=1)
 
-    # Create noise-based explosion
-    noise = np.random.normal(0, 1, len(t))
-
-    # Add some low frequency rumble
-    rumble = np.sin(2 * np.pi * 50 * t)
-
-    wave_data = noise + rumble
-
-    # Apply envelope
-    envelope = np.exp(-10 * t/duration)
-    wave_data = wave_data * envelope
-
-    # Normalize and apply volume
-    wave_data = wave_data / np.max(np.abs(wave_data)) * volume
-
-    # Convert to 16-bit integer values
-    wave_data = (wave_data * 32767).astype(np.int16)
-
-    # Create WAV file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(wave_data.tobytes())
-
-def create_hit_sound(filename, duration=0.2, volume=0.4, sample_rate=44100):
+def hit_patch(duration=0.2, volume=0.4):
     """Create a metallic hit sound with reverb"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-
-    # Main impact - high frequency ping
-    freq_start = 880  # A5 note
-    freq_end = 440   # A4 note
-    freq = np.exp(-5 * t/duration) * freq_start + (1 - np.exp(-5 * t/duration)) * freq_end
-    wave_data = np.sin(2 * np.pi * freq * t)
-
-    # Add metallic overtones
-    overtones = [1.5, 2, 2.5, 3]  # Metallic harmonics
-    for harmonic in overtones:
-        wave_data += 0.3 * np.sin(2 * np.pi * freq * harmonic * t) * np.exp(-10 * t/duration)
-
-    # Add some noise burst at the start
-    noise_duration = int(sample_rate * 0.05)  # 50ms noise
-    noise = np.random.normal(0, 0.5, len(t))
-    noise_envelope = np.zeros_like(t)
-    noise_envelope[:noise_duration] = np.exp(-10 * np.linspace(0, 1, noise_duration))
-    wave_data += noise * noise_envelope
-
-    # Apply main envelope
-    envelope = np.exp(-5 * t/duration)
-    wave_data = wave_data * envelope
-
-    # Normalize and apply volume
-    wave_data = wave_data / np.max(np.abs(wave_data)) * volume
-
-    # Convert to 16-bit integer values
-    wave_data = (wave_data * 32767).astype(np.int16)
-
-    # Create WAV file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(wave_data.tobytes())
-
-def create_game_over_sound(filename, duration=1.0, volume=0.5, sample_rate=44100):
+    # Main impact: a ping gliding from A5 to A4
+    freq = 440 + 440 * Exp(5 / duration)
+    ping = Osc(freq)
+    # Metallic overtones
+    overtones = Osc(freq, [(1.5, 0.3), (2, 0.3), (2.5, 0.3), (3, 0.3)]) * Exp(10 / duration)
+    # Noise burst at the start
+    burst = Noise(0.5) * Burst(0.05, 10)
+    return Patch(duration, (ping + overtones + burst) * Exp(5 / duration),
+                 peak=volume, endpoint=True, seed=2)
+
+def game_over_note(freq):
+    # Note with slight 5 Hz vibrato, plus two overtones without it
+    return (Osc(FM(freq, 5, 0.02)) + Osc(freq, [(2, 0.3), (3, 0.2)])) * Exp(2 / 0.25)
+
+def game_over_patch(duration=1.0, volume=0.5):
     """Create a sad game over melody"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-    wave_data = np.zeros_like(t)
-
-    # Define a short sad melody (A minor scale: A -> G -> F -> E)
-    notes = [
-        (440.0, 0.0, 0.25),    # A4
-        (392.0, 0.25, 0.25),   # G4
-        (349.2, 0.5, 0.25),    # F4
-        (329.6, 0.75, 0.25)    # E4
-    ]
-
-    # Generate each note
-    for freq, start, note_duration in notes:
-        # Convert time to samples
-        start_idx = int(start * sample_rate)
-        duration_samples = int(note_duration * sample_rate)
-        end_idx = start_idx + duration_samples
-
-        # Create note envelope
-        note_t = np.linspace(0, note_duration, duration_samples)
-        envelope = np.exp(-2 * note_t/note_duration)
+    # A short sad melody (A minor scale: A -> G -> F -> E)
+    notes = [440.0, 392.0, 349.2, 329.6]
+    melody = Sequence([(i * 0.25, 0.25, game_over_note(freq)) for i, freq in enumerate(notes)])
+    return Patch(duration, melody, peak=volume, endpoint=True)
 
-        # Generate note with slight vibrato
-        vibrato = 1 + 0.02 * np.sin(2 * np.pi * 5 * note_t)  # 5 Hz vibrato
-        note = np.sin(2 * np.pi * freq * note_t * vibrato)
-
-        # Add some harmonics for richness
-        note += 0.3 * np.sin(2 * np.pi * freq * 2 * note_t)  # First overtone
-        note += 0.2 * np.sin(2 * np.pi * freq * 3 * note_t)   # Second overtone
-
-        # Apply envelope to this note
-        note = note * envelope
-
-        # Add to main wave
-        wave_data[start_idx:end_idx] += note
-
-    # Normalize and apply volume
-    wave_data = wave_data / np.max(np.abs(wave_data)) * volume
-
-    # Convert to 16-bit integer values
-    wave_data = (wave_data * 32767).astype(np.int16)
-
-    # Create WAV file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(wave_data.tobytes())
-
-def create_charge_sound(filename, duration=0.1, volume=0.3, sample_rate=44100):
+def charge_patch(duration=0.1, volume=0.3):
     """Create a rising pitch sound for charging"""
-    t = np.linspace(0, duration, int(sample_rate * duration))
-
-    # Create rising frequency
-    freq_start = 200
-    freq_end = 800
-    freq = np.linspace(freq_start, freq_end, len(t))
-
-    wave_data = np.sin(2 * np.pi * freq * t)
-
-    # Add some harmonics
-    wave_data += 0.3 * np.sin(4 * np.pi * freq * t)
-
-    # Apply envelope
-    envelope = np.exp(-1 * t/duration)  # Gentler fade-out
-    wave_data = wave_data * envelope
-
-    # Normalize and apply volume
-    wave_data = wave_data / np.max(np.abs(wave_data)) * volume
-
-    # Convert to 16-bit integer values
-    wave_data = (wave_data * 32767).astype(np.int16)
+    return Patch(duration, Osc(Line(200, 800), [(1, 1.0), (2, 0.3)]) * Exp(1 / duration),
+                 peak=volume, endpoint=True)
 
-    # Create WAV file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(wave_data.tobytes())
-
-def create_shield_recharge_sound(filename):
+def shield_recharge_patch():
     """Create a happy recharge sound for shield powerup"""
-    duration = 0.4  # seconds
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-
-    # Create a rising happy tone
-    base_freq = 440  # Start at A4
-    freq_mult = 1.5  # How much the frequency increases
-
-    # Create two tones that rise in pitch
-    tone1 = np.sin(2 * np.pi * base_freq * (1 + t * freq_mult) * t)
-    tone2 = np.sin(2 * np.pi * (base_freq * 1.5) * (1 + t * freq_mult) * t)
-
-    # Add some sparkle with high frequency beeps
-    sparkle = np.sin(2 * np.pi * 1500 * t) * np.exp(-t * 20)
-    sparkle += np.sin(2 * np.pi * 2000 * t) * np.exp(-t * 15)
-
-    # Combine the sounds
-    audio = tone1 * 0.3 + tone2 * 0.3 + sparkle * 0.2
-
-    # Apply a happy envelope
-    envelope = np.exp(-t * 3) * 0.7 + np.exp(-t * 8) * 0.3
-    audio = audio * envelope
-
-    # Normalize and convert to 16-bit integer
-    audio = np.int16(audio * 32767)
-
-    # Save to file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
-
-def create_ufo_hit_sound(filename):
+    # Two tones a fifth apart rising in pitch from A4
+    tones = Osc(440 * (1 + Time() * 1.5), [(1, 0.3), (1.5, 0.3)])
+    # Sparkle with high frequency beeps
+    sparkle = Osc(1500) * Exp(20) * 0.2 + Osc(2000) * Exp(15) * 0.2
+    envelope = Exp(3) * 0.7 + Exp(8) * 0.3
+    return Patch(0.4, (tones + sparkle) * envelope)
+
+def ufo_hit_patch():
     """Create a metallic hit sound for UFO being damaged"""
-    duration = 0.1
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    clang = Osc(800, [(1, 0.5), (1.5, 0.3)])
+    return Patch(0.1, clang * Exp(30), peak=1.0, clip=True)
 
-    # Metallic clang
-    freq = 800
-    audio = np.sin(2 * np.pi * freq * t) * 0.5
-    audio += np.sin(2 * np.pi * freq * 1.5 * t) * 0.3
-
-    # Quick decay
-    envelope = np.exp(-t * 30)
-    audio = audio * envelope
-
-    audio = audio / np.max(np.abs(audio))
-
-    # Normalize and save
-    audio = np.clip(audio, -1, 1)
-    audio = np.int16(audio * 32767)
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
-
-def create_ufo_death_sound(filename):
+def ufo_death_patch():
     """Create explosion sound for UFO death"""
-    duration = 0.5
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-
-    # Base explosion
-    noise = np.random.uniform(-1, 1, len(t))
-
-    # Add some metallic frequencies
-    freqs = [300, 450, 600]
-    audio = noise * 0.5
-    for freq in freqs:
-        audio += np.sin(2 * np.pi * freq * t) * 0.2
-
-    # Envelope with quick attack and slow decay
-    envelope = np.exp(-t * 8)
-    audio = audio * envelope
-
-    # Normalize and save
-    audio = np.clip(audio, -1, 1)
-    audio = np.int16(audio * 32767)
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
+    # Noise burst with some metallic frequencies
+    metal = Osc(300, [(1, 0.2), (1.5, 0.2), (2, 0.2)])
+    return Patch(0.5, (Noise(1.0, 'uniform') * 0.5 + metal) * Exp(8), clip=True, seed=3)
 
-def create_ufo_shoot_sound(filename, volume=0.3):
+def ufo_shoot_patch(volume=0.3):
     """Create alien-like shooting sound"""
-    duration = 0.2
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-
-    # High pitched alien sound
-    freq = 2000
-    freq_mod = 1 + np.sin(2 * np.pi * 20 * t) * 0.3  # Frequency modulation
-    audio = np.sin(2 * np.pi * freq * t * freq_mod)
-
-    # Add some noise
-    noise = np.random.uniform(-1, 1, len(t)) * 0.1
-    audio = audio + noise
-
-    # Quick decay envelope
-    envelope = np.exp(-t * 15)
-    audio = audio * envelope
-    audio = audio / np.max(np.abs(audio)) * volume
-
-    # Normalize and save
-    audio = np.clip(audio, -1, 1)
-    audio = np.int16(audio * 32767)
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
-
-def create_title_music():
-    # Create a heroic theme in C major
-    sample_rate = 44100
-    duration = 4.0  # 4 seconds of music
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-
-    # Main melody (heroic theme)
-    melody_notes = [
-        (523.25, 0.5),    # C5 (0.5s)
-        (659.25, 0.5),    # E5
-        (783.99, 0.5),    # G5
-        (1046.50, 0.5),   # C6
-        (783.99, 0.5),    # G5
-        (659.25, 0.5),    # E5
-        (523.25, 1.0),    # C5 (held longer)
-    ]
-
-    # Create the melody
-    melody = np.zeros_like(t)
-    current_time = 0
-
+    # High pitched, frequency modulated alien sound with some noise
+    audio = Osc(FM(2000, 20, 0.3)) + Noise(0.1, 'uniform')
+    return Patch(0.2, audio * Exp(15), peak=volume, clip=True, seed=4)
+
+# Main melody (heroic theme in C major): (frequency, seconds)
+TITLE_MELODY = [
+    (523.25, 0.5),    # C5 (0.5s)
+    (659.25, 0.5),    # E5
+    (783.99, 0.5),    # G5
+    (1046.50, 0.5),   # C6
+    (783.99, 0.5),    # G5
+    (659.25, 0.5),    # E5
+    (523.25, 1.0),    # C5 (held longer)
+]
+TITLE_BASS = 261.63  # C4
+
+# Streamed music themes: a melody phrase, its bass note, and the key shifts
+# (in semitones) that successive phrases move through
+MUSIC_THEMES = {
+    'title': {'melody': TITLE_MELODY, 'bass': TITLE_BASS, 'keys': [0, 0, 5, 7]},
+}
+
+# Title theme timbre: fundamental plus two harmonics
+TITLE_PARTIALS = [(1, 0.3), (2, 0.15), (3, 0.1)]
+
+def title_note(freq, dur):
+    # Add some envelope for smoother sound
+    return Osc(freq, TITLE_PARTIALS) * Fade(0.05 * dur, 0.1 * dur)
+
+def title_bass(freq):
+    # Bass line decaying over the phrase
+    return Osc(freq) * 0.2 * Exp(1)
+
+def title_music_patch():
+    # One phrase of the heroic theme, 4 seconds
+    events, start = [], 0.0
+    for freq, dur in TITLE_MELODY:
+        events.append((start, dur, title_note(freq, dur)))
+        start += dur
+    return Patch(start, Sequence(events, local=False) + title_bass(TITLE_BASS))
+
+def render_phrase(melody_notes, bass_freq, sample_rate=SAMPLE_RATE):
+    """Yield a phrase one note at a time: melody with harmonics over a decaying bass"""
+    start = 0
     for freq, dur in melody_notes:
-        samples = int(dur * sample_rate)
-        start = int(current_time * sample_rate)
-        end = start + samples
-        if end > len(t):
-            break
-
-        # Add some envelope for smoother sound
-        envelope = np.ones(samples)
-        attack = int(0.05 * samples)
-        decay = int(0.1 * samples)
-        envelope[:attack] = np.linspace(0, 1, attack)
-        envelope[-decay:] = np.linspace(1, 0, decay)
-
-        note = 0.3 * np.sin(2 * np.pi * freq * t[start:end])  # Main sine wave
-        # Add harmonics for richer sound
-        note += 0.15 * np.sin(4 * np.pi * freq * t[start:end])  # First harmonic
-        note += 0.1 * np.sin(6 * np.pi * freq * t[start:end])   # Second harmonic
-
-        melody[start:end] += note * envelope
-        current_time += dur
-
-    # Add a bass line
-    bass_freq = 261.63  # C4
-    bass = 0.2 * np.sin(2 * np.pi * bass_freq * t)
-    bass *= np.exp(-t)  # Add decay
-
-    # Combine melody and bass
-    audio = melody + bass
-
-    # Normalize
-    audio = np.int16(audio * 32767)
-
-    # Save
-    with wave.open('sounds/title_music.wav', 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
-
-def create_ufo_presence_sound():
+        note = Patch(dur, title_note(freq, dur) + title_bass(bass_freq), start=start / sample_rate)
+        yield synth.render(note, sample_rate)
+        start += int(dur * sample_rate)
+
+def music_blocks(theme='title', block_frames=4096, sample_rate=SAMPLE_RATE, seed=None):
+    """Endless generator of fixed-size float blocks of a theme.
+
+    Phrases are synthesised a note at a time, so memory stays constant however
+    long it plays. Each phrase moves to the theme's next key and may drop a
+    note an octave to keep repeats from sounding identical.
+    """
+    spec = MUSIC_THEMES[theme]
+    rng = np.random.default_rng(seed)
+    pending = np.zeros(0)
+    phrase = 0
+    while True:
+        shift = 2 ** (spec['keys'][phrase % len(spec['keys'])] / 12)
+        melody = [(freq * shift * (0.5 if phrase and rng.random() < 0.15 else 1), dur)
+                  for freq, dur in spec['melody']]
+        for chunk in render_phrase(melody, spec['bass'] * shift, sample_rate):
+            pending = np.concatenate([pending, chunk])
+            while len(pending) >= block_frames:
+                yield pending[:block_frames]
+                pending = pending[block_frames:]
+        phrase += 1
+
+
+def ufo_presence_patch():
     """Create a low wobbly sound for UFO presence"""
-    sample_rate = 44100
-    duration = 2.0  # 2 second sound that will loop
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-
-    # Base frequency for UFO sound (low pitch)
-    base_freq = 80.0
-
-    # Create wobble effect with LFO (Low Frequency Oscillator)
-    lfo_freq = 2.0  # 2 Hz wobble
-    wobble = 10.0 * np.sin(2 * np.pi * lfo_freq * t)  # +/- 10 Hz wobble
-
-    # Combine base frequency with wobble
-    frequency = base_freq + wobble
-
-    # Generate the sound with frequency modulation
-    audio = 0.3 * np.sin(2 * np.pi * frequency * t)  # Main sine wave
-    # Add some harmonics for richer sound
-    audio += 0.15 * np.sin(4 * np.pi * frequency * t)  # First harmonic
-    audio += 0.1 * np.sin(6 * np.pi * frequency * t)   # Second harmonic
-
-    # Add subtle noise for texture
-    noise = np.random.normal(0, 0.05, len(t))
-    audio += noise * 0.1
-
-    # Apply slow amplitude modulation
-    amp_mod = 0.7 + 0.3 * np.sin(2 * np.pi * 0.5 * t)  # 0.5 Hz amplitude modulation
-    audio *= amp_mod
-
-    # Normalize and convert to 16-bit integer
-    audio = np.int16(audio * 32767)
-
-    # Save the sound
-    with wave.open('sounds/ufo_presence.wav', 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 2 bytes per sample
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
-
-def create_explosion_sound():
+    # 80 Hz hum wobbling +/- 10 Hz at 2 Hz, with harmonics
+    hum = Osc(FM(80.0, 2.0, 0.125), [(1, 0.3), (2, 0.15), (3, 0.1)])
+    # Subtle noise for texture
+    texture = Noise(0.005)
+    # Slow 0.5 Hz amplitude modulation
+    amp_mod = 0.7 + Osc(0.5) * 0.3
+    return Patch(2.0, (hum + texture) * amp_mod, seed=5)  # 2 second sound that will loop
+
+def explosion_patch():
     """Create a powerful explosion sound effect"""
-    # Parameters for explosion sound
-    duration = 1.0  # 1 second
-    sample_rate = 44100
-    num_samples = int(duration * sample_rate)
-
-    # Create initial burst of noise
-    noise = np.random.uniform(-0.8, 0.8, num_samples)
-
-    # Create low frequency rumble
-    t = np.linspace(0, duration, num_samples)
-    bass_freq = 80  # Low frequency for the rumble
-    rumble = np.sin(2 * np.pi * bass_freq * t) * 0.5
-
-    # Combine noise and rumble
-    explosion = noise + rumble
-
-    # Apply envelope
-    attack_time = 0.02  # Very quick attack
-    decay_time = 0.8   # Long decay
-
-    attack_samples = int(attack_time * sample_rate)
-    decay_samples = int(decay_time * sample_rate)
-
-    # Create envelope
-    envelope = np.ones(num_samples)
-    # Attack phase
-    envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-    # Decay phase
-    decay_start = attack_samples
-    envelope[decay_start:] = np.linspace(1, 0, num_samples - decay_start)
-
-    # Apply envelope to sound
-    explosion = explosion * envelope
-
+    # Initial burst of noise over a low frequency rumble
+    explosion = Noise(0.8, 'uniform') + Osc(80) * 0.5
+    # Very quick attack, long linear decay
+    envelope = Fade(0.02, 0.98)
     # Add some distortion for more impact
-    explosion = np.clip(explosion * 1.5, -1, 1)
-
-    # Convert to 16-bit integer samples
-    explosion = np.int16(explosion * 32767)
-
-    # Save the sound
-    with wave.open('sounds/explosion.wav', 'wb') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(explosion.tobytes())
+    return Patch(1.0, Clip(explosion * envelope * 1.5), endpoint=True, seed=6)
 
-def create_blob_sound(filename):
+def blob_patch():
     """Create a weird, slimy sound for tentacle blob"""
-    duration = 0.3
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-
-    # Base frequency modulation (lower frequency for more alien sound)
-    base_freq = 200
-    freq_mod = 1 + np.sin(2 * np.pi * 4 * t) * 0.5  # Slower, deeper wobble
-
-    # Create main sound with frequency modulation (further reduced amplitude)
-    audio = 0.15 * np.sin(2 * np.pi * base_freq * t * freq_mod)  # Reduced from 0.3 to 0.15
-
-    # Add harmonic overtones (further reduced amplitudes)
-    audio += 0.05 * np.sin(4 * np.pi * base_freq * t * freq_mod)  # Reduced from 0.1 to 0.05
-    audio += 0.025 * np.sin(6 * np.pi * base_freq * t * freq_mod)  # Reduced from 0.05 to 0.025
-
-    # Add bubbling effect (further reduced amplitudes)
-    bubble_freqs = [400, 600, 800]
-    for freq in bubble_freqs:
-        bubble_mod = 1 + np.sin(2 * np.pi * 2 * t) * 0.2
-        audio += 0.015 * np.sin(2 * np.pi * freq * t * bubble_mod)  # Reduced from 0.03 to 0.015
-
-    # Apply envelope with slight fade-in and fade-out
-    fade_samples = int(0.05 * sample_rate)  # 50ms fade
-    envelope = np.ones_like(t)
-    envelope[:fade_samples] = np.linspace(0, 1, fade_samples)
-    envelope[-fade_samples:] = np.linspace(1, 0, fade_samples)
-    audio = audio * envelope
-
-    # Additional overall volume reduction
-    audio = audio * 0.25  # Reduced from 0.5 to 0.25
-
-    # Normalize and convert to 16-bit integer
-    audio = audio / np.max(np.abs(audio))  # Normalize
-    audio = np.int16(audio * 8192)  # Reduced from 16384 to 8192 (quarter volume)
-
-    # Save to file
-    with wave.open(filename, 'wb') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio.tobytes())
-
-def main():
+    # Deep wobbling alien tone with harmonic overtones
+    body = Osc(FM(200, 4, 0.5), [(1, 0.15), (2, 0.05), (3, 0.025)])
+    # Bubbling effect
+    bubbles = Osc(FM(1, 2, 0.2), [(400, 0.015), (600, 0.015), (800, 0.015)])
+    # Slight fade-in and fade-out, quarter volume
+    return Patch(0.3, (body + bubbles) * Fade(0.05, 0.05), peak=8192 / 32767)
+
+# Every game sound: name -> (patch factory, factory keyword arguments)
+SOUND_ASSETS = {
+    'shoot': (laser_patch, {}),  # Basic laser shoot sound
+    'laser': (laser_patch, {'duration': 0.2, 'volume': 0.35}),  # Longer, stronger laser sound
+    'spread': (spread_laser_patch, {}),  # Clean laser for spread
+    'hit': (hit_patch, {}),  # Hit sound
+    'game_over': (game_over_patch, {}),  # Game over sound
+    'power_up': (power_up_patch, {}),  # Mario-style power up sound
+    'enemy_death': (enemy_death_patch, {}),  # Enemy death sound
+    'charge': (charge_patch, {}),  # Rising pitch charge sound
+    'shield_recharge': (shield_recharge_patch, {}),  # Happy recharge sound
+    'ufo_hit': (ufo_hit_patch, {}),  # UFO hit sound
+    'ufo_death': (ufo_death_patch, {}),  # UFO death sound
+    'ufo_shoot': (ufo_shoot_patch, {'volume': 0.3}),  # UFO shoot sound at 30% volume
+    'title_music': (title_music_patch, {}),  # Title screen music
+    'ufo_presence': (ufo_presence_patch, {}),  # UFO presence sound
+    'explosion': (explosion_patch, {}),
+    'blob': (blob_patch, {}),  # Tentacle blob sound
+}
+
+def patch(name):
+    factory, params = SOUND_ASSETS[name]
+    return factory(**params)
+
+def render(name, sample_rate=SAMPLE_RATE):
+    """Render a game sound by name as float samples"""
+    return synth.render(patch(name), sample_rate)
+
+# Rapidly repeated sounds get extra pitch-shifted renders to rotate through:
+# name -> number of variants besides the original
+SOUND_VARIANTS = {
+    'shoot': 4,
+    'laser': 4,
+    'spread': 3,
+    'ufo_shoot': 3,
+}
+VARIANT_PITCH_RANGE = 0.06  # Variants span +/-6% in pitch
+VARIANT_GAIN_RANGE = 0.1    # and up to 10% quieter
+
+def variant_name(name, index):
+    return f'{name}~{index}'
+
+def resample_variants(samples, ratios, gains):
+    """Pitch-shift samples by every ratio at once with linear interpolation.
+
+    All variants are computed in one pass over a (variants, frames) grid;
+    returns one array per ratio, each trimmed to its own length.
+    """
+    lengths = (len(samples) / ratios).astype(int)
+    positions = np.arange(lengths.max()) * ratios[:, None]
+    # Rows shorter than the grid run past the end; clamp them, they get trimmed
+    base = np.minimum(positions.astype(int), len(samples) - 1)
+    frac = positions - base
+    padded = np.append(samples, 0.0)  # Interpolating off the last sample fades to silence
+    grid = padded[base] * (1 - frac) + padded[base + 1] * frac
+    grid *= gains[:, None]
+    return [row[:length] for row, length in zip(grid, lengths)]
+
+def variants_of(name, samples):
+    """The pitch/level variants of a sound listed in SOUND_VARIANTS, from its samples"""
+    count = SOUND_VARIANTS[name]
+    rng = np.random.default_rng(sum(name.encode()))  # Same variants every build
+    ratios = 1 + np.linspace(-VARIANT_PITCH_RANGE, VARIANT_PITCH_RANGE, count)
+    gains = 1 - rng.uniform(0, VARIANT_GAIN_RANGE, count)
+    return resample_variants(samples, ratios, gains)
+
+def render_variants(name, sample_rate=SAMPLE_RATE):
+    """Render the pitch/level variants of a sound listed in SOUND_VARIANTS"""
+    return variants_of(name, render(name, sample_rate))
+
+# Next to this script, so builds and the game find it from any working directory
+SOUNDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sounds')
+
+def sound_path(name):
+    return os.path.join(SOUNDS_DIR, f'{name}.wav')
+
+# Hash of each asset's inputs as of its last build, keyed by output file name
+CACHE_MANIFEST = os.path.join(SOUNDS_DIR, '.cache.json')
+
+def describe(value):
+    """Stable text form of a patch graph: every node's type and settings.
+
+    Covers whatever the factory pulled in to build it, such as TITLE_MELODY
+    or TITLE_PARTIALS, which the factory's own source does not show.
+    """
+    if isinstance(value, (Patch, synth.Node)):
+        fields = ', '.join(f'{key}={describe(item)}' for key, item in sorted(vars(value).items()))
+        return f'{type(value).__name__}({fields})'
+    if isinstance(value, np.ndarray):
+        return describe(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return '[' + ', '.join(describe(item) for item in value) + ']'
+    return repr(value)
+
+def asset_hash(name):
+    """Hash a sound's patch graph, the synth engine and the WAV writer"""
+    digest = hashlib.sha256()
+    digest.update(inspect.getsource(synth).encode())
+    for function in (encode_pcm, write_wav):
+        digest.update(inspect.getsource(function).encode())
+    digest.update(describe(patch(name)).encode())
+    return digest.hexdigest()
+
+def load_manifest():
+    try:
+        with open(CACHE_MANIFEST) as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    with open(CACHE_MANIFEST, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+# Packed sound bank: every sound pre-encoded in the game's mixer format
+# (matching pygame.mixer.pre_init in space_flapper.main) in one mmap-able file.
+#   header: magic, bank_hash of its inputs, sample rate, sample size,
+#           channels, sound count
+#   index:  one (name, offset, length) entry per sound
+#   blobs:  raw interleaved PCM, each starting on a BANK_ALIGN boundary
+BANK_PATH = os.path.join(SOUNDS_DIR, 'bank.sfb')
+BANK_FORMAT = (44100, -16, 2)
+BANK_MAGIC = b'SFBANK02'
+BANK_HEADER = struct.Struct('<8s32sIhHI')
+BANK_ENTRY = struct.Struct('<32sQQ')
+BANK_ALIGN = 64
+
+def bank_hash(digests):
+    """Hash the bank's inputs: every asset digest plus the bank layout"""
+    digest = hashlib.sha256()
+    for name in sorted(digests):
+        digest.update(f'{name}={digests[name]}'.encode())
+    digest.update(repr((BANK_FORMAT, SOUND_VARIANTS, VARIANT_PITCH_RANGE, VARIANT_GAIN_RANGE)).encode())
+    for function in (write_bank, read_wav, resample_variants, variants_of):
+        digest.update(inspect.getsource(function).encode())
+    return digest.hexdigest()
+
+def current_bank_hash():
+    """bank_hash of the sounds as create_sounds.py declares them right now"""
+    return bank_hash({name: asset_hash(name) for name in SOUND_ASSETS})
+
+def write_bank(digest, path=BANK_PATH, sound_format=BANK_FORMAT):
+    """Pack every sound's WAV file, plus its variants, into a single bank file.
+
+    Nothing is synthesised here: the bank reuses the samples the asset builds
+    wrote, so those must be up to date first. digest is the bank_hash of
+    those inputs, stored so readers can tell a stale bank.
+    """
+    sample_rate, size, channels = sound_format
+    rendered = {}
+    for name in SOUND_ASSETS:
+        rendered[name], wav_rate = read_wav(sound_path(name))
+        if wav_rate != sample_rate:
+            raise ValueError(f"{sound_path(name)} is {wav_rate} Hz, the bank needs {sample_rate} Hz")
+    blobs = [(name, encode_pcm(samples, size, channels).tobytes())
+             for name, samples in rendered.items()]
+    for name in SOUND_VARIANTS:
+        for index, samples in enumerate(variants_of(name, rendered[name])):
+            blobs.append((variant_name(name, index), encode_pcm(samples, size, channels).tobytes()))
+
+    offset = BANK_HEADER.size + BANK_ENTRY.size * len(blobs)
+    index = []
+    for name, blob in blobs:
+        offset += -offset % BANK_ALIGN
+        index.append((name, offset, len(blob)))
+        offset += len(blob)
+
+    with open(path, 'wb') as bank_file:
+        bank_file.write(BANK_HEADER.pack(BANK_MAGIC, bytes.fromhex(digest), sample_rate, size, channels,
+                                         len(blobs)))
+        for name, blob_offset, length in index:
+            bank_file.write(BANK_ENTRY.pack(name.encode(), blob_offset, length))
+        for (name, blob_offset, length), (_, blob) in zip(index, blobs):
+            bank_file.write(b'\0' * (blob_offset - bank_file.tell()))
+            bank_file.write(blob)
+
+def open_bank(path=BANK_PATH):
+    """Map a bank file; returns ((rate, size, channels), bank_hash, {name: memoryview}).
+
+    The views borrow the mapping, so it stays open for as long as they live.
+    """
+    with open(path, 'rb') as bank_file:
+        bank = mmap.mmap(bank_file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, digest, sample_rate, size, channels, count = BANK_HEADER.unpack_from(bank, 0)
+    if magic != BANK_MAGIC:
+        raise ValueError(f"{path} is not a sound bank")
+    view = memoryview(bank)
+    blobs = {}
+    for i in range(count):
+        name, offset, length = BANK_ENTRY.unpack_from(bank, BANK_HEADER.size + i * BANK_ENTRY.size)
+        blobs[name.rstrip(b'\0').decode()] = view[offset:offset + length]
+    return (sample_rate, size, channels), digest.hex(), blobs
+
+def build_asset(name):
+    """Render one sound to its WAV file; executed in a worker process"""
+    write_wav(sound_path(name), render(name))
+    return name
+
+def main(force=False):
     try:
-        os.makedirs('sounds', exist_ok=True)
-        create_laser_sound('sounds/shoot.wav')  # Basic laser shoot sound
-        create_laser_sound('sounds/laser.wav', duration=0.2, volume=0.35)  # Longer, stronger laser sound
-        create_spread_laser_sound('sounds/spread.wav')  # Clean laser for spread
-        create_hit_sound('sounds/hit.wav')  # Hit sound
-        create_game_over_sound('sounds/game_over.wav')  # Game over sound
-        create_power_up_sound('sounds/power_up.wav')  # Mario-style power up sound
-        create_enemy_death_sound('sounds/enemy_death.wav')  # Enemy death sound
-        create_charge_sound('sounds/charge.wav')  # Rising pitch charge sound
-        create_shield_recharge_sound('sounds/shield_recharge.wav')  # Happy recharge sound
-        create_ufo_hit_sound('sounds/ufo_hit.wav')  # UFO hit sound
-        create_ufo_death_sound('sounds/ufo_death.wav')  # UFO death sound
-        create_ufo_shoot_sound('sounds/ufo_shoot.wav', volume=0.3)  # UFO shoot sound at 30% volume
-        create_title_music()  # Title screen music
-        create_ufo_presence_sound()  # UFO presence sound
-        create_explosion_sound()
-        create_blob_sound('sounds/blob.wav')  # Add blob sound creation
-        print("Successfully created sound files!")
+        os.makedirs(SOUNDS_DIR, exist_ok=True)
+        manifest = {} if force else load_manifest()
+
+        # Only rebuild assets whose inputs changed or whose file is missing
+        digests = {name: asset_hash(name) for name in SOUND_ASSETS}
+        stale = [name for name, digest in digests.items()
+                 if manifest.get(f'{name}.wav') != digest or not os.path.exists(sound_path(name))]
+        # The bank holds every sound, so any change repacks it
+        bank_digest = bank_hash(digests)
+        bank_key = os.path.basename(BANK_PATH)
+        bank_stale = manifest.get(bank_key) != bank_digest or not os.path.exists(BANK_PATH)
+
+        if not stale and not bank_stale:
+            print("All sound files are up to date.")
+            return
+
+        # Generate stale assets in parallel, so a full rebuild takes about as
+        # long as the slowest single sound
+        created = 0
+        failed = False
+        with ProcessPoolExecutor() as pool:
+            futures = [(pool.submit(build_asset, name), name) for name in stale]
+            for future, name in futures:
+                filename = sound_path(name)
+                try:
+                    future.result()
+                    manifest[f'{name}.wav'] = digests[name]
+                    created += 1
+                except Exception as e:
+                    failed = True
+                    print(f"Error creating {filename}: {str(e)}")
+
+        # Packed from the WAVs just written, so only once they all succeeded
+        if bank_stale and not failed:
+            try:
+                write_bank(bank_digest)
+                manifest[bank_key] = bank_digest
+                created += 1
+            except Exception as e:
+                print(f"Error creating {BANK_PATH}: {str(e)}")
+
+        save_manifest(manifest)
+        print(f"Successfully created {created} sound files!")
     except Exception as e:
         print(f"Error creating sounds: {str(e)}")
 
 if __name__ == "__main__":
-    main()
+    main(force='--force' in sys.argv)
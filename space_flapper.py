@@ -1,11 +1,20 @@
 import pygame
+import numpy as np
 import random
 import sys
 import math
+import json
+import os
+import heapq
+import time
+import queue
+import threading
+from collections import deque
 from enum import Enum, auto
 
 # Constants
-SCREEN_WIDTH = 400
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))  # waves/ and sounds/ live next to the game
+SCREEN_WIDTH = 400   # World size in game units; every bound is in these
 SCREEN_HEIGHT = 600
 GRAVITY = 0.25
 FLAP_STRENGTH = -7
@@ -17,11 +26,126 @@ MIN_GAP_SIZE = 100     # Minimum gap size
 GAP_DECREASE_RATE = 20  # How much to decrease gap per level
 PIPE_WIDTH = 50
 
+# Ray-cast sensor
+SENSOR_NUM_RAYS = 16
+SENSOR_FAN_ANGLE = 180  # Degrees, centred on the bird's facing direction
+SENSOR_MAX_DISTANCE = 400
+
+# Entity types reported by the ray-cast sensor
+HIT_NONE = 0
+HIT_PIPE = 1
+HIT_GATE = 2
+HIT_ENEMY = 3
+HIT_UFO = 4
+HIT_UFO_BULLET = 5
+HIT_BLOB = 6
+HIT_TENTACLE = 7
+
 # Game States
 MENU = 0
 PLAYING = 1
 GAME_OVER = 2
 
+# Actions for programmatic control, combinable as bit flags
+ACTION_NONE = 0
+ACTION_FLAP = 1
+ACTION_SHOOT = 2
+
+TICK_MS = 1000 / 60  # Simulated time per tick when stepping programmatically
+
+# Nuke blast
+NUKE_DAMAGE = 100  # Damage at the centre, falling off linearly to the edge
+NUKE_EXPANDING_BLAST = False  # Damage entities as the shock wave reaches them instead of all at once
+
+# Stars, pipes and enemies are stored as archetype arrays (see Archetype)
+ENEMY_SIZE = 20
+ENEMY_HITBOX = ENEMY_SIZE * 0.8  # Collision box is 80% of visual size
+NUM_STARS = 50
+# Hostile projectiles share one pool; speed is in pixels per tick
+HOSTILE_SHOT_SPEED = 10
+HOSTILE_SHOT_RADIUS = 3
+
+# Bloom post-process, see Bloom. Channel levels above the threshold glow.
+BLOOM = True
+BLOOM_THRESHOLD = 160
+BLOOM_DOWNSAMPLE = 4  # Blur at a quarter of the world size, whatever the render scale
+BLOOM_SIGMA = 1.5     # Blur width in downsampled pixels
+BLOOM_STRENGTH = 2.0
+
+# Particle effects, see ParticleSystem
+PARTICLE_CAPACITY = 16384
+PARTICLE_DRAG = 0.96  # Velocity kept per tick
+
+# Spawn rules run by the SpawnScheduler. interval is in ms; a tuple is a
+# per-level curve whose last entry holds for all later levels. Optional keys:
+# chance of spawning when due, min_score, limit on how many may be alive at
+# once and retry, the delay before another try when a spawn is skipped
+# (a full interval by default).
+SPAWN_RULES = {
+    'pipe': {'interval': PIPE_FREQUENCY},
+    'enemy': {'interval': 2000},
+    'powerup': {'interval': 8000},
+    'gate': {'interval': 6000},
+    'ufo': {'interval': 1000, 'chance': 0.11, 'min_score': 6, 'limit': 1},  # ~0.2% a frame
+    'blob': {'interval': 20000, 'chance': 0.2, 'min_score': 51, 'limit': 1, 'retry': 4000},
+}
+
+# Difficulties are data files in waves/: rules replacing SPAWN_RULES entries
+# (null removes one) and the enemy formations the 'wave' rule cycles through
+DIFFICULTIES = ['normal', 'swarm']
+
+# Frames are drawn at RENDER_SCALE times the world size and presented to the
+# window by Display. Below 1 renders low and upscales, above 1 supersamples.
+RENDER_SCALE = 1.0
+WINDOW_SIZE = None  # None fits the window to the desktop with pygame.SCALED
+FULLSCREEN = False
+
+# Render quality tiers, stepped by the QualityGovernor
+FRAME_BUDGET_MS = 1000 / 60
+QUALITY_FULL = 0
+QUALITY_NO_GLOW = 1         # Drop the bloom pass
+QUALITY_REDUCED_DETAIL = 2  # Also fewer tentacle segments and stars
+QUALITY_MINIMAL = 3         # Also no alpha layers for explosions
+QUALITY_TIER_NAMES = ['FULL', 'NO GLOW', 'REDUCED', 'MINIMAL']
+
+# Sound dispatch: all mixer channels are reserved for the dispatcher, which
+# hands them out by priority. A voice may only steal a channel from an equal
+# or lower priority voice.
+SOUND_CHANNELS = 16
+PRIORITY_LOW = 0     # Rapid weapon fire
+PRIORITY_NORMAL = 1  # Hits and deaths
+PRIORITY_HIGH = 2    # One-off events the player must hear
+PRIORITY_MUSIC = 3   # Music and looping ambience, never stolen by effects
+# Sound name -> (priority, max simultaneous voices)
+SOUND_VOICES = {
+    'shoot': (PRIORITY_LOW, 2),
+    'laser': (PRIORITY_LOW, 2),
+    'spread': (PRIORITY_LOW, 2),
+    'ufo_shoot': (PRIORITY_LOW, 2),
+    'charge': (PRIORITY_NORMAL, 1),
+    'hit': (PRIORITY_NORMAL, 2),
+    'enemy_death': (PRIORITY_NORMAL, 3),
+    'ufo_hit': (PRIORITY_NORMAL, 2),
+    'blob': (PRIORITY_NORMAL, 1),
+    'ufo_death': (PRIORITY_HIGH, 1),
+    'power_up': (PRIORITY_HIGH, 1),
+    'shield_recharge': (PRIORITY_HIGH, 1),
+    'explosion': (PRIORITY_HIGH, 1),
+    'game_over': (PRIORITY_HIGH, 1),
+    'ufo_presence': (PRIORITY_MUSIC, 1),
+    'title_music': (PRIORITY_MUSIC, 1),
+}
+
+# Optional software mixing of one-shot effects into a single streamed channel,
+# which lifts the channel limit and pans effects by where they happen
+SOFTWARE_MIXER = False
+MIXER_BLOCK_FRAMES = 1024  # Frames per streamed block, about 23 ms at 44.1 kHz
+MIXER_MAX_VOICES = 512
+
+# Streamed music: block size and how many blocks the worker may run ahead
+MUSIC_BLOCK_FRAMES = 4096  # About 93 ms at 44.1 kHz
+MUSIC_QUEUE_BLOCKS = 4
+
 # Weapon Types
 class WeaponType(Enum):
     DEFAULT = auto()
@@ -56,6 +180,386 @@ DARK_GREEN = (0, 20, 0)
 DARK_BLUE = (0, 0, 20)
 DARK_RED = (50, 0, 0)
 
+class SilentSound:
+    """Stand-in for pygame.mixer.Sound when there is no audio"""
+    def play(self, loops=0, maxtime=0, fade_ms=0, x=None):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, value):
+        pass
+
+class SoundCue:
+    """A named game sound whose play() requests go through the dispatcher"""
+    def __init__(self, dispatcher, name, sound):
+        self.dispatcher = dispatcher
+        self.name = name
+        self.sound = sound
+        self.variants = []  # Pre-rendered alternatives played in turn with sound
+        self.turn = 0
+        self.priority, self.max_voices = SOUND_VOICES.get(name, (PRIORITY_NORMAL, 1))
+
+    def play(self, loops=0, maxtime=0, fade_ms=0, x=None):
+        """Queue a play; x is the emitter's screen position, used for panning"""
+        self.dispatcher.request(self, loops, x)
+
+    def stop(self):
+        self.dispatcher.stop(self)
+
+    def set_volume(self, value):
+        for sound in [self.sound] + self.variants:
+            sound.set_volume(value)
+
+    def next_sound(self):
+        """The sound for the next voice, rotating through any variants"""
+        if not self.variants:
+            return self.sound
+        self.turn = (self.turn + 1) % (len(self.variants) + 1)
+        return self.variants[self.turn - 1] if self.turn else self.sound
+
+class SoftwareMixer:
+    """Sums any number of one-shot voices into blocks streamed to one channel.
+
+    Each voice is a mono source with a left/right gain pair from its pan.
+    Mixing a block is one gather and one (2, V) x (V, frames) product per
+    distinct source, so cost barely depends on the number of voices.
+    """
+    def __init__(self, channel, mixer_format, block_frames=MIXER_BLOCK_FRAMES, max_voices=MIXER_MAX_VOICES):
+        self.channel = channel
+        self.sample_rate, self.size, self.channels = mixer_format
+        self.block_frames = block_frames
+        self.max_voices = max_voices
+        self.sources = []       # Mono float32 samples plus one trailing silent frame
+        self.source_index = {}  # Sound -> index into self.sources
+        self.voice_source = np.empty(0, dtype=np.intp)
+        self.voice_pos = np.empty(0, dtype=np.intp)
+        self.voice_gain = np.empty((0, 2), dtype=np.float32)
+        self.voice_cues = []
+
+    @staticmethod
+    def supports(mixer_format):
+        _, size, channels = mixer_format
+        return size in (-16, 32, -32) and channels in (1, 2)
+
+    def source(self, sound):
+        """Index of sound's mono float samples, decoding it on first use"""
+        index = self.source_index.get(sound)
+        if index is None:
+            frames = pygame.sndarray.array(sound)
+            if frames.ndim > 1:
+                frames = frames[:, 0]  # Sounds are mono content duplicated per channel
+            samples = frames.astype(np.float32)
+            if self.size == -16:
+                samples /= 32768
+            self.sources.append(np.append(samples, np.float32(0)))
+            index = self.source_index[sound] = len(self.sources) - 1
+        return index
+
+    def play(self, cue, sound, x=None):
+        # Constant-power pan, scaled so a centred voice matches a mixer channel
+        pan = 0.5 if x is None else min(max(x / SCREEN_WIDTH, 0.0), 1.0)
+        volume = sound.get_volume() * math.sqrt(2)
+        gain = [[volume * math.cos(pan * math.pi / 2), volume * math.sin(pan * math.pi / 2)]]
+        self.voice_source = np.append(self.voice_source, self.source(sound))
+        self.voice_pos = np.append(self.voice_pos, 0)
+        self.voice_gain = np.append(self.voice_gain, np.array(gain, dtype=np.float32), axis=0)
+        self.voice_cues.append(cue)
+        if len(self.voice_cues) > self.max_voices:
+            self.keep(np.arange(len(self.voice_cues)) >= len(self.voice_cues) - self.max_voices)
+
+    def stop(self, cue):
+        if cue in self.voice_cues:
+            self.keep(np.array([voice_cue is not cue for voice_cue in self.voice_cues], dtype=bool))
+
+    def keep(self, mask):
+        self.voice_source = self.voice_source[mask]
+        self.voice_pos = self.voice_pos[mask]
+        self.voice_gain = self.voice_gain[mask]
+        self.voice_cues = [cue for cue, kept in zip(self.voice_cues, mask) if kept]
+
+    def mix_block(self):
+        """Mix the next block of every voice and retire the finished ones"""
+        out = np.zeros((2, self.block_frames), dtype=np.float32)
+        offsets = np.arange(self.block_frames)
+        for index in np.unique(self.voice_source):
+            voices = self.voice_source == index
+            samples = self.sources[index]
+            # Reads past the end land on the trailing silent frame
+            positions = np.minimum(self.voice_pos[voices, None] + offsets, len(samples) - 1)
+            out += self.voice_gain[voices].T @ samples[positions]
+        self.voice_pos += self.block_frames
+        lengths = np.array([len(samples) - 1 for samples in self.sources])
+        self.keep(self.voice_pos < lengths[self.voice_source])
+        return out
+
+    def encode(self, out):
+        """Turn a (2, frames) float block into a Sound in the mixer format"""
+        np.clip(out, -1.0, 1.0, out=out)
+        frames = out.T if self.channels == 2 else out.mean(axis=0)
+        if self.size == -16:
+            frames = (frames * 32767).astype(np.int16)
+        return pygame.mixer.Sound(buffer=np.ascontiguousarray(frames).tobytes())
+
+    def pump(self):
+        """Keep one block playing and one queued while any voice is active"""
+        if not self.voice_cues:
+            return
+        if not self.channel.get_busy():
+            self.channel.play(self.encode(self.mix_block()))
+        if self.voice_cues and self.channel.get_queue() is None:
+            self.channel.queue(self.encode(self.mix_block()))
+
+class SoundDispatcher:
+    """Collects play requests during a frame and starts them in one flush.
+
+    Repeated requests for the same cue within a frame collapse into a single
+    play, each cue is limited to its max voices (its oldest voice is
+    restarted), and when every channel is busy a new voice takes the channel
+    of the oldest voice with equal or lower priority, or is dropped. With a
+    software mixer, one-shot effects skip all that and go to the mixer.
+    """
+    def __init__(self):
+        self.cues = {}
+        self.pending = {}  # cue -> (loops, x), in request order
+        self.channels = []
+        self.voices = []   # Per channel: (cue, frame started) or None
+        self.frame = 0
+        self.mixer = None
+
+    def setup(self, num_channels=SOUND_CHANNELS, software_mixer=SOFTWARE_MIXER):
+        """Take over the mixer's channels; call once the mixer is initialised"""
+        pygame.mixer.set_num_channels(num_channels)
+        pygame.mixer.set_reserved(num_channels)  # Keep Sound.play() off our channels
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+        mixer_format = pygame.mixer.get_init()
+        if software_mixer and SoftwareMixer.supports(mixer_format):
+            # The last channel carries the software mix
+            self.mixer = SoftwareMixer(self.channels.pop(), mixer_format)
+        self.voices = [None] * len(self.channels)
+
+    def take_channel(self):
+        """Withdraw a channel from voice allocation for a stream's exclusive use"""
+        self.voices.pop()
+        return self.channels.pop()
+
+    def cue(self, name, sound, variants=()):
+        """The cue for name, pointed at sound; one cue object per name for good"""
+        cue = self.cues.get(name)
+        if cue is None:
+            cue = self.cues[name] = SoundCue(self, name, sound)
+        else:
+            cue.sound = sound
+        cue.variants = list(variants)
+        return cue
+
+    def request(self, cue, loops=0, x=None):
+        if cue in self.pending and self.pending[cue][0] < 0:
+            return  # A looping request already covers this one
+        self.pending[cue] = (loops, x)
+
+    def stop(self, cue):
+        self.pending.pop(cue, None)
+        if self.mixer is not None:
+            self.mixer.stop(cue)
+        for i, voice in enumerate(self.voices):
+            if voice is not None and voice[0] is cue:
+                self.channels[i].stop()
+                self.voices[i] = None
+
+    def flush(self):
+        """Start this frame's requests, highest priority first"""
+        self.frame += 1
+        if self.pending and self.channels:
+            # Forget voices whose channel has finished
+            for i, voice in enumerate(self.voices):
+                if voice is not None and not self.channels[i].get_busy():
+                    self.voices[i] = None
+
+            for cue in sorted(self.pending, key=lambda cue: -cue.priority):
+                loops, x = self.pending[cue]
+                if self.mixer is not None and loops == 0 and cue.priority < PRIORITY_MUSIC:
+                    self.mixer.play(cue, cue.next_sound(), x)
+                    continue
+                i = self.pick_channel(cue)
+                if i is None:
+                    continue
+                self.channels[i].play(cue.next_sound(), loops)
+                self.voices[i] = (cue, self.frame)
+        self.pending.clear()  # Also drops requests made with no mixer to play on
+        if self.mixer is not None:
+            self.mixer.pump()
+
+    def pick_channel(self, cue):
+        """Index of the channel a new voice of cue should use, or None to drop it"""
+        own = [i for i, voice in enumerate(self.voices) if voice is not None and voice[0] is cue]
+        if len(own) >= cue.max_voices:
+            return min(own, key=lambda i: self.voices[i][1])  # Restart the oldest
+        for i, voice in enumerate(self.voices):
+            if voice is None:
+                return i
+        candidates = [i for i, voice in enumerate(self.voices) if voice[0].priority <= cue.priority]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda i: (self.voices[i][0].priority, self.voices[i][1]))
+
+sound_dispatcher = SoundDispatcher()
+
+# Game sounds, assigned in main(). Silent until then so the game can also be
+# driven without a mixer (see Game.step).
+shoot_sound = laser_sound = spread_sound = hit_sound = shield_up_sound = \
+power_up_sound = game_over_sound = enemy_death_sound = charge_sound = \
+shield_recharge_sound = ufo_hit_sound = ufo_death_sound = ufo_shoot_sound = \
+title_music = ufo_presence_sound = explosion_sound = blob_sound = SilentSound()
+
+class QualityGovernor:
+    """Steps render quality down when frames run over budget and back up with headroom"""
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, window=30):
+        self.budget_ms = budget_ms
+        self.frame_times = deque(maxlen=window)
+        self.tier = QUALITY_FULL
+        self.downgrade_ratio = 0.9  # Average above 90% of budget drops a tier
+        self.upgrade_ratio = 0.5    # Average below 50% of budget restores a tier
+
+    def record(self, frame_ms):
+        """Record the time spent on one frame and adjust the tier if needed"""
+        self.frame_times.append(frame_ms)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return
+
+        average = self.average_ms()
+        if average > self.budget_ms * self.downgrade_ratio and self.tier < QUALITY_MINIMAL:
+            self.tier += 1
+            self.frame_times.clear()  # Measure the new tier from scratch
+        elif average < self.budget_ms * self.upgrade_ratio and self.tier > QUALITY_FULL:
+            self.tier -= 1
+            self.frame_times.clear()
+
+    def average_ms(self):
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+governor = QualityGovernor()
+
+class View:
+    """How many frame pixels one world unit takes; draw code multiplies by scale"""
+    def __init__(self, scale=RENDER_SCALE):
+        self.scale = scale
+
+    @property
+    def size(self):
+        """Pixel size of a frame holding the whole world"""
+        return (round(SCREEN_WIDTH * self.scale), round(SCREEN_HEIGHT * self.scale))
+
+    def point(self, x, y):
+        return (int(x * self.scale), int(y * self.scale))
+
+    def rect(self, x, y, width, height):
+        s = self.scale
+        return (x * s, y * s, width * s, height * s)
+
+    def width(self, value):
+        """Line thickness in whole pixels, never below one"""
+        return max(1, round(value * self.scale))
+
+view = View()
+
+def ui_font(size):
+    """Default font at a size given in world units"""
+    return pygame.font.Font(None, max(1, round(size * view.scale)))
+
+class Display:
+    """The window, and the frame the game draws into at the render scale.
+
+    Without a fixed window size and without supersampling, the window is
+    opened with pygame.SCALED at the frame size: the frame is the display
+    surface itself and SDL stretches it over the window or desktop, so
+    upscaling costs the CPU nothing. Otherwise the frame is an offscreen
+    surface that present() fits into the window keeping its aspect ratio,
+    with a plain scale when enlarging and smoothscale when shrinking a
+    supersampled frame.
+    """
+    def __init__(self, render_scale=RENDER_SCALE, window_size=WINDOW_SIZE, fullscreen=FULLSCREEN):
+        view.scale = render_scale
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        if window_size is None and render_scale <= 1:
+            self.window = pygame.display.set_mode(view.size, flags | pygame.SCALED)
+            self.frame = self.window
+            return
+        if window_size is None:
+            # Desktop size in fullscreen, otherwise one pixel per world unit
+            window_size = (0, 0) if fullscreen else (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.window = pygame.display.set_mode(window_size, flags)
+        self.frame = pygame.Surface(view.size)
+        frame_width, frame_height = self.frame.get_size()
+        window_width, window_height = self.window.get_size()
+        fit = min(window_width / frame_width, window_height / frame_height)
+        self.target = pygame.Rect(0, 0, round(frame_width * fit), round(frame_height * fit))
+        self.target.center = self.window.get_rect().center
+        self.scaled = pygame.Surface(self.target.size, 0, self.window)
+
+    def present(self):
+        """Put the finished frame on the window; the caller flips"""
+        if self.frame is self.window:
+            return
+        if self.target.size == self.frame.get_size():
+            self.window.blit(self.frame, self.target)
+            return
+        if self.target.width < self.frame.get_width():
+            pygame.transform.smoothscale(self.frame, self.target.size, self.scaled)
+        else:
+            pygame.transform.scale(self.frame, self.target.size, self.scaled)
+        self.window.blit(self.scaled, self.target)
+
+class Layer:
+    """One named stage of the frame.
+
+    A live layer (no key) draws straight into the frame every frame. A cached
+    layer's draw returns (surface, position) pairs instead; they are kept and
+    replayed with the layer's blend mode until the layer is dirty, either
+    through invalidate() or because key(), a summary of the state it shows,
+    changed.
+    """
+    def __init__(self, name, draw, key=None, blend=0):
+        self.name = name
+        self.draw = draw
+        self.key = key
+        self.blend = blend
+        self.dirty = True
+        self.last_key = None
+        self.blits = []
+
+    def invalidate(self):
+        self.dirty = True
+
+    def render(self, frame, current_time):
+        if self.key is None:
+            self.draw(frame, current_time)
+            return
+        key = (frame.get_size(), self.key())
+        if self.dirty or key != self.last_key:
+            self.blits = [(surface, position, None, self.blend)
+                          for surface, position in self.draw(frame, current_time)]
+            self.last_key = key
+            self.dirty = False
+        frame.blits(self.blits, doreturn=False)
+
+class Compositor:
+    """Named layers drawn into the frame in order, bottom first"""
+    def __init__(self, layers):
+        self.layers = {layer.name: layer for layer in layers}
+
+    def invalidate(self, name=None):
+        """Mark one layer, or all of them, to be redrawn"""
+        for layer in ([self.layers[name]] if name else self.layers.values()):
+            layer.invalidate()
+
+    def render(self, frame, current_time):
+        for layer in self.layers.values():
+            layer.render(frame, current_time)
+
 class Weapon:
     def __init__(self, type=WeaponType.DEFAULT):
         self.type = type
@@ -106,7 +610,7 @@ class Weapon:
 
             # Background
             pygame.draw.rect(screen, (50, 50, 50),
-                           (meter_x, meter_y, meter_width, meter_height))
+                           view.rect(meter_x, meter_y, meter_width, meter_height))
 
             # Charge level bar
             charge_width = int(meter_width * (self.charge_level / 100))
@@ -118,19 +622,19 @@ class Weapon:
                 color = (255, 255, 0)  # Yellow for normal charge
 
             pygame.draw.rect(screen, color,
-                           (meter_x, meter_y, charge_width, meter_height))
+                           view.rect(meter_x, meter_y, charge_width, meter_height))
 
             # Draw percentage text
-            font = pygame.font.Font(None, 24)
+            font = ui_font(24)
             charge_text = f"{self.charge_level}%"
             text_surface = font.render(charge_text, True, (255, 255, 255))
-            text_rect = text_surface.get_rect(midtop=(x, meter_y + meter_height + 5))
+            text_rect = text_surface.get_rect(midtop=view.point(x, meter_y + meter_height + 5))
             screen.blit(text_surface, text_rect)
 
             # Draw "SUPER" text when fully charged
             if self.charge_level >= 80:
                 super_text = font.render("SUPER!", True, (255, 165, 0))
-                super_rect = super_text.get_rect(midtop=(x, meter_y - 20))
+                super_rect = super_text.get_rect(midtop=view.point(x, meter_y - 20))
                 screen.blit(super_text, super_rect)
 
     def release_charge(self, x, y, current_time):
@@ -149,7 +653,7 @@ class Weapon:
 
             # Super charge creates a circular blast pattern
             if self.charge_level >= 80:
-                laser_sound.play()  # Strong charge uses laser sound
+                laser_sound.play(x=x)  # Strong charge uses laser sound
                 num_bullets = 16  # Number of bullets in the circle
                 for i in range(num_bullets):
                     angle = (360 / num_bullets) * i  # Evenly space bullets in a circle
@@ -157,7 +661,7 @@ class Weapon:
                     bullets.append(bullet)
             else:
                 # Normal charge just shoots forward
-                shoot_sound.play()
+                shoot_sound.play(x=x)
                 bullet = Bullet(x, y, WeaponType.CHARGE, charge_level=self.charge_level)
                 bullets.append(bullet)
 
@@ -176,7 +680,7 @@ class Weapon:
             self.ammo -= 1
 
             if self.type == WeaponType.SPREAD:
-                spread_sound.play()
+                spread_sound.play(x=x)
                 bullets = []
                 angles = [-30, -15, 0, 15, 30]  # 5 bullets at different angles
                 for angle in angles:
@@ -187,10 +691,10 @@ class Weapon:
                         self.type = WeaponType.DEFAULT
                 return bullets, self.ammo == 0
             elif self.type == WeaponType.LASER:
-                laser_sound.play()
+                laser_sound.play(x=x)
                 return [Bullet(x, y, self.type)], self.ammo == 0
             else:  # Default weapon
-                shoot_sound.play()
+                shoot_sound.play(x=x)
                 return [Bullet(x, y, self.type)], self.ammo == 0
 
         return [], False
@@ -199,6 +703,9 @@ class Bullet:
     def __init__(self, x, y, weapon_type, charge_level=0, angle=0, velocity=None):
         self.x = x
         self.y = y
+        # Position before the last move, for swept collision
+        self.prev_x = x
+        self.prev_y = y
         self.weapon_type = weapon_type
         self.angle = math.radians(angle)
 
@@ -214,20 +721,17 @@ class Bullet:
             self.radius = 10 + int((charge_level / 100) * 10)
             self.damage = 2 + int((charge_level / 100) * 4)
             self.color = (255, 255, 0)  # Yellow
-            self.glow_color = (255, 255, 200)  # Light yellow for glow
         elif weapon_type == WeaponType.SPREAD:
             self.velocity = 8 if velocity is None else velocity
             self.radius = 8  # Medium size
             self.damage = 2
             self.color = (255, 0, 255)  # Purple
-            self.glow_color = (255, 128, 255)  # Light purple for glow
         elif weapon_type == WeaponType.LASER:
             self.velocity = 12 if velocity is None else velocity  # Faster for laser
             self.width = 20  # Longer rectangle
             self.height = 4  # Thinner rectangle
             self.damage = 1
             self.color = (0, 128, 255)  # Blue
-            self.glow_color = (128, 200, 255)  # Light blue for glow
         else:  # DEFAULT
             self.velocity = 10 if velocity is None else velocity
             self.width = 10
@@ -236,49 +740,53 @@ class Bullet:
             self.color = (0, 255, 0)  # Green
 
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.velocity * math.cos(self.angle)
         self.y += self.velocity * math.sin(self.angle)
 
+    @property
+    def bounds(self):
+        """Extent around (x, y) in world units, see sprite()"""
+        if self.weapon_type == WeaponType.NUKE:
+            return (-self.radius - 11, -self.radius - 1, 2 * self.radius + 12, 2 * self.radius + 2)
+        if self.weapon_type in (WeaponType.CHARGE, WeaponType.SPREAD):
+            return (-self.radius - 1, -self.radius - 1, 2 * self.radius + 2, 2 * self.radius + 2)
+        top = -(self.height // 2) if self.weapon_type == WeaponType.LASER else 0
+        return (0, top - 1, self.width + 1, self.height + 2)
+
+    def look(self, current_time):
+        return self.weapon_type, getattr(self, 'radius', 0)
+
     def draw(self, screen):
+        screen.blits(entity_blits([self], 0), doreturn=False)
+
+    def paint(self, surface, x, y, look):
+        s = view.scale
         if self.weapon_type == WeaponType.NUKE:
             # Draw nuke missile with trail
-            pygame.draw.circle(screen, self.color,
-                             (int(self.x), int(self.y)), self.radius)
+            pygame.draw.circle(surface, self.color,
+                             view.point(x, y), self.radius * s)
             # Add orange trail
             for i in range(3):
-                trail_x = self.x - (i * 5)
+                trail_x = x - (i * 5)
                 trail_radius = self.radius - (i * 1)
                 if trail_radius > 0:
-                    pygame.draw.circle(screen, self.trail_color,
-                                     (int(trail_x), int(self.y)), trail_radius)
-        elif self.weapon_type == WeaponType.CHARGE:
-            # Draw charge bullet with glow effect
-            # Draw outer glow
-            pygame.draw.circle(screen, self.glow_color,
-                             (int(self.x), int(self.y)), self.radius + 2)
-            # Draw main bullet
-            pygame.draw.circle(screen, self.color,
-                             (int(self.x), int(self.y)), self.radius)
-        elif self.weapon_type == WeaponType.SPREAD:
-            # Spread bullet with glow
-            pygame.draw.circle(screen, self.glow_color,
-                             (int(self.x), int(self.y)), self.radius + 2)
-            pygame.draw.circle(screen, self.color,
-                             (int(self.x), int(self.y)), self.radius)
+                    pygame.draw.circle(surface, self.trail_color,
+                                     view.point(trail_x, y), trail_radius * s)
+        elif self.weapon_type in (WeaponType.CHARGE, WeaponType.SPREAD):
+            # Round bullets; their glow comes from the bloom pass
+            pygame.draw.circle(surface, self.color,
+                             view.point(x, y), self.radius * s)
         elif self.weapon_type == WeaponType.LASER:
-            # Laser bullet with glow effect
-            pygame.draw.rect(screen, self.glow_color,
-                           (int(self.x), int(self.y - self.height//2 - 1),
-                            self.width + 2, self.height + 2))
-            pygame.draw.rect(screen, self.color,
-                           (int(self.x), int(self.y - self.height//2),
-                            self.width, self.height))
+            pygame.draw.rect(surface, self.color,
+                           view.rect(x, y - self.height//2, self.width, self.height))
         else:  # DEFAULT
-            pygame.draw.rect(screen, self.color,
-                           (int(self.x), int(self.y), self.width, self.height))
+            pygame.draw.rect(surface, self.color,
+                           view.rect(x, y, self.width, self.height))
 
     def is_off_screen(self):
-        return self.x > 400 or self.x < 0 or self.y > 600 or self.y < 0
+        return self.x > SCREEN_WIDTH or self.x < 0 or self.y > SCREEN_HEIGHT or self.y < 0
 
     def get_rect(self):
         """Get bullet's collision rectangle"""
@@ -298,13 +806,17 @@ class Bullet:
                              self.width, self.height)
 
 class Bird:
+    # Shape, shared with the collision silhouette
+    radius = 15  # Increased from 10 to 15
+    ear_size = 6  # Increased from 4 to 6
+    ear_spacing = 12  # Increased from 8 to 12
+
     def __init__(self):
         self.x = 50
         self.y = SCREEN_HEIGHT // 2
         self.velocity = 0
         self.gravity = 0.5
         self.flap_strength = -8
-        self.radius = 15  # Increased from 10 to 15
         self.shields = 3
         self.max_shields = 3
         self.last_hit_time = 0
@@ -326,8 +838,6 @@ class Bird:
 
         # Ear properties
         self.ear_color = self.get_color()  # Get initial color based on shields
-        self.ear_size = 6  # Increased from 4 to 6
-        self.ear_spacing = 12  # Increased from 8 to 12
 
         # Set initial color based on shields
         self.color = self.get_color()
@@ -376,13 +886,20 @@ class Bird:
         if self.invincible and current_time - self.invincible_start >= self.invincible_duration:
             self.invincible = False
 
-    def take_hit(self, current_time):
+        # Advance explosion if active
+        if self.explosion:
+            self.explosion.update()
+            if self.explosion.is_finished:
+                self.explosion = None
+
+    def take_hit(self, current_time, particles):
         # If invincible, ignore the hit
         if self.invincible:
             return False
 
         # Play hit sound
-        hit_sound.play()
+        hit_sound.play(x=self.x)
+        particles.burst(self.x, self.y, 40, self.color)
 
         # If already at 0 shields, die
         if self.shields <= 0:
@@ -430,13 +947,13 @@ class Bird:
         for i in range(self.shields):
             box_x = start_x + (self.shield_box_size + self.shield_box_spacing) * i
             color = self.shield_colors[self.shields]
-            pygame.draw.rect(screen, color,
-                           (box_x, box_y, self.shield_box_size, self.shield_box_size))
+            box = view.rect(box_x, box_y, self.shield_box_size, self.shield_box_size)
+            pygame.draw.rect(screen, color, box)
             # Draw white border
-            pygame.draw.rect(screen, (255, 255, 255),
-                           (box_x, box_y, self.shield_box_size, self.shield_box_size), 1)
+            pygame.draw.rect(screen, (255, 255, 255), box, view.width(1))
 
     def draw(self, screen, current_time, score):
+        s = view.scale
         should_draw_bird = True
         if self.invincible:
             time_since_hit = current_time - self.invincible_start
@@ -451,26 +968,26 @@ class Bird:
             # Draw triangular ears
             for ear_x in [left_ear_x, right_ear_x]:
                 points = [
-                    (ear_x, ear_y),  # Top point
-                    (ear_x - self.ear_size//2, ear_y + self.ear_size),  # Bottom left
-                    (ear_x + self.ear_size//2, ear_y + self.ear_size)   # Bottom right
+                    (ear_x * s, ear_y * s),  # Top point
+                    ((ear_x - self.ear_size//2) * s, (ear_y + self.ear_size) * s),  # Bottom left
+                    ((ear_x + self.ear_size//2) * s, (ear_y + self.ear_size) * s)   # Bottom right
                 ]
                 pygame.draw.polygon(screen, self.ear_color, points)
 
             # Draw the body
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+            pygame.draw.circle(screen, self.color, view.point(self.x, self.y), self.radius * s)
 
             # Draw the eye
             eye_y = self.y - 2  # Slightly above center for cute look
 
             # Draw white part of eye
-            pygame.draw.circle(screen, self.eye_color, (int(self.x), int(eye_y)), self.eye_size)
+            pygame.draw.circle(screen, self.eye_color, view.point(self.x, eye_y), self.eye_size * s)
 
             # Draw pupil (black part)
             # Make pupils look slightly towards the bird (left)
             pupil_offset = 2
             pygame.draw.circle(screen, self.pupil_color,
-                             (int(self.x + pupil_offset), int(eye_y)), self.pupil_size)
+                             view.point(self.x + pupil_offset, eye_y), self.pupil_size * s)
 
         # Always draw UI elements
         # Draw shield boxes
@@ -485,9 +1002,6 @@ class Bird:
         # Draw explosion if active
         if self.explosion:
             self.explosion.draw(screen)
-            self.explosion.update()
-            if self.explosion.is_finished:
-                self.explosion = None
 
         # Draw ammo bar if not using default weapon
         if self.weapon.type != WeaponType.DEFAULT:
@@ -499,7 +1013,7 @@ class Bird:
 
             # Draw background (empty bar)
             pygame.draw.rect(screen, (50, 50, 50),
-                           (bar_x, bar_y, bar_width, bar_height))
+                           view.rect(bar_x, bar_y, bar_width, bar_height))
 
             # Calculate filled portion
             if self.weapon.ammo != float('inf'):
@@ -524,14 +1038,7 @@ class Bird:
 
                 # Draw filled portion
                 pygame.draw.rect(screen, bar_color,
-                               (bar_x, bar_y, fill_width, bar_height))
-
-                # Add glow effect
-                glow_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
-                glow_color = (*bar_color, 100)  # Semi-transparent version of bar color
-                pygame.draw.rect(glow_surface, glow_color,
-                               (0, 0, fill_width, bar_height))
-                screen.blit(glow_surface, (bar_x, bar_y - 1))  # Slight offset for glow
+                               view.rect(bar_x, bar_y, fill_width, bar_height))
 
     def shoot(self, current_time):
         if current_time - self.weapon.last_shot_time >= self.weapon.cooldown:
@@ -547,14 +1054,14 @@ class Bird:
                     return bullets, False  # Never reset here, wait for detonation
                 elif self.weapon.type == WeaponType.DEFAULT:
                     bullets.append(Bullet(self.x, self.y, self.weapon.type))
-                    shoot_sound.play()
+                    shoot_sound.play(x=self.x)
                 elif self.weapon.type == WeaponType.SPREAD:
                     for angle in [-15, 0, 15]:
                         bullets.append(Bullet(self.x, self.y, self.weapon.type, angle=angle))
-                    spread_sound.play()
+                    spread_sound.play(x=self.x)
                 elif self.weapon.type == WeaponType.LASER:
                     bullets.append(Bullet(self.x, self.y, self.weapon.type))
-                    laser_sound.play()
+                    laser_sound.play(x=self.x)
 
                 if self.weapon.type != WeaponType.DEFAULT and self.weapon.type != WeaponType.NUKE:
                     self.weapon.ammo -= 1
@@ -592,43 +1099,40 @@ class Bird:
             nuke = Bullet(self.x + self.radius * 2, self.y, WeaponType.NUKE, velocity=3)
             self.active_nuke = nuke
 
-    def detonate_nuke(self, enemies, bullets, screen, ufos, gates, blobs):
-        """Detonate the nuke, destroying all enemies on screen"""
+    def detonate_nuke(self, enemies, bullets, ufos, gates, blobs, particles, current_time=None):
+        """Detonate the nuke, damaging everything within the blast radius"""
         if not self.active_nuke:
             return False, 0
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
 
         # Create explosion at nuke position
         self.explosion = Explosion(self.active_nuke.x, self.active_nuke.y)
-        explosion_sound.play()
+        explosion_sound.play(x=self.active_nuke.x)
+        particles.burst(self.active_nuke.x, self.active_nuke.y, 600, (255, 165, 0), speed=10, life=60)
 
         # Remove the nuke from bullets
         if self.active_nuke in bullets:
             bullets.remove(self.active_nuke)
         self.active_nuke = None
 
-        # Count enemies killed
-        enemies_killed = len(enemies) + len(ufos) + len(blobs)
-
-        # Clear all enemies
-        enemies.clear()
-        if len(ufos) > 0:
-            ufos.clear()
-            ufo_presence_sound.stop()  # Stop UFO sound when all UFOs are destroyed
-        blobs.clear()
-
-        # Destroy all gates
-        for gate in gates:
-            gate.destroyed = True
+        # Damage everything in the blast now, unless the shock wave applies it
+        # as it expands (see Game.update)
+        enemies_killed = 0
+        if not self.explosion.expanding:
+            enemies_killed = apply_blast(self.explosion, self.explosion.radius,
+                                         enemies, ufos, gates, blobs, particles, current_time)
 
         # Return True only if this was the last nuke AND it's detonated
         return self.weapon.ammo <= 0, enemies_killed
 
 class PowerUp:
+    size = 20  # Radius, shared with the collision silhouette
+
     def __init__(self, type, x, y):
         self.type = type
         self.x = x
         self.y = y
-        self.size = 20
         self.collected = False
         self.scroll_speed = 2  # Same speed as pipes
 
@@ -651,44 +1155,44 @@ class PowerUp:
             return self.x < -self.size  # Return True if powerup is off screen to the left
         return False
 
-    def draw(self, screen):
-        if not self.collected:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-            # Draw a white border
-            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.size, 2)
+    @property
+    def bounds(self):
+        return (-self.size - 1, -self.size - 1, 2 * self.size + 2, 2 * self.size + 2)
 
-    def get_rect(self):
-        """Get powerup's collision rectangle"""
-        collision_size = self.size * 0.8  # Make collision box 80% of visual size
-        return pygame.Rect(self.x - collision_size, self.y - collision_size,
-                         collision_size * 2, collision_size * 2)
+    def look(self, current_time):
+        return self.type
+
+    def paint(self, surface, x, y, look):
+        centre = view.point(x, y)
+        pygame.draw.circle(surface, self.color, centre, self.size * view.scale)
+        # Draw a white border
+        pygame.draw.circle(surface, (255, 255, 255), centre, self.size * view.scale, view.width(2))
 
     def collect(self, bird):
-        power_up_sound.play()
+        power_up_sound.play(x=self.x)
         if self.type == PowerUpType.SHIELD:
             if bird.shields < bird.max_shields:
                 bird.shields += 1
-                shield_recharge_sound.play()
+                shield_recharge_sound.play(x=self.x)
                 bird.update_color()
         else:
             weapon_type = WeaponType[self.type.name]
             bird.weapon = Weapon(weapon_type)
 
 class TentacleBlob:
-    def __init__(self, x=None, y=None):
+    def __init__(self, x=None, y=None, current_time=None, rng=random):
         self.x = x if x is not None else SCREEN_WIDTH + 20
-        self.y = y if y is not None else random.randint(50, SCREEN_HEIGHT - 50)
+        self.y = y if y is not None else rng.randint(50, SCREEN_HEIGHT - 50)
         self.radius = 15
         self.health = 3
         self.color = (255, 0, 255)  # Changed from green to purple
-        self.glow_color = (255, 128, 255)  # Changed to light purple glow
 
         # Movement parameters
         self.speed = 3
         self.movement_timer = 0
-        self.direction_change_delay = random.randint(30, 60)
+        self.direction_change_delay = rng.randint(30, 60)
         self.dx = -self.speed
-        self.dy = random.choice([-1, 1]) * self.speed
+        self.dy = rng.choice([-1, 1]) * self.speed
         self.moving_right = False  # Track direction
 
         # Tentacle parameters
@@ -696,29 +1200,28 @@ class TentacleBlob:
         self.base_tentacle_length = 100  # Base length
         self.tentacle_length = self.base_tentacle_length
         self.tentacle_segments = 15
-        self.tentacles = []
         self.tentacle_wiggle_speed = 0.08
         self.tentacle_phase = 0
         self.tentacle_thickness = 5
 
         # Tentacle growth parameters
-        self.length_modifiers = [1.0] * self.num_tentacles  # Individual length modifiers
-        self.growth_speeds = [random.uniform(0.02, 0.04) for _ in range(self.num_tentacles)]
-        self.growth_phases = [random.uniform(0, 2 * math.pi) for _ in range(self.num_tentacles)]
+        self.length_modifiers = np.ones(self.num_tentacles)  # Individual length modifiers
+        self.growth_speeds = np.array([rng.uniform(0.02, 0.04) for _ in range(self.num_tentacles)])
+        self.growth_phases = np.array([rng.uniform(0, 2 * math.pi) for _ in range(self.num_tentacles)])
         self.min_length_factor = 0.7  # Minimum length is 70% of base
         self.max_length_factor = 1.3  # Maximum length is 130% of base
 
         # Initialize tentacles with evenly spaced angles
         angle_step = (2 * math.pi) / self.num_tentacles  # Evenly space tentacles
-        for i in range(self.num_tentacles):
-            angle = i * angle_step  # This will space them evenly around the circle
-            self.tentacles.append({
-                'angle': angle,
-                'segments': [(self.x, self.y) for _ in range(self.tentacle_segments)]
-            })
+        self.tentacle_angles = np.arange(self.num_tentacles) * angle_step
+        # Joint positions of every tentacle: (tentacle, segment, xy)
+        self.tentacle_points = np.empty((self.num_tentacles, self.tentacle_segments, 2))
+        self.tentacle_points[:, :] = (self.x, self.y)
+        # Per-joint wave offsets along a tentacle, reused every frame
+        self.segment_wave_offsets = np.arange(1, self.tentacle_segments) * 0.5
 
         # Sound parameters
-        self.last_sound_time = pygame.time.get_ticks()
+        self.last_sound_time = pygame.time.get_ticks() if current_time is None else current_time
         self.sound_interval = 2000  # Play sound every 2 seconds
         self.sound_started = False  # Track if we've started playing sounds
 
@@ -727,27 +1230,25 @@ class TentacleBlob:
         self.flash_duration = 5  # Frames to show flash
         self.is_flashing = False
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
-
+    def update(self, current_time):
         # Play periodic sound when on screen
         if not self.sound_started and self.x < SCREEN_WIDTH - self.radius:
-            blob_sound.play()
+            blob_sound.play(x=self.x)
             self.sound_started = True
             self.last_sound_time = current_time
         elif self.sound_started and current_time - self.last_sound_time >= self.sound_interval:
-            blob_sound.play()
+            blob_sound.play(x=self.x)
             self.last_sound_time = current_time
 
         # Change direction at screen edges
         if self.x < self.radius and not self.moving_right:
             self.dx = self.speed  # Move right
             self.moving_right = True
-            blob_sound.play()  # Play sound when changing direction
+            blob_sound.play(x=self.x)  # Play sound when changing direction
         elif self.x > SCREEN_WIDTH - self.radius and self.moving_right:
             self.dx = -self.speed  # Move left
             self.moving_right = False
-            blob_sound.play()  # Play sound when changing direction
+            blob_sound.play(x=self.x)  # Play sound when changing direction
 
         # Update position
         self.x += self.dx
@@ -761,36 +1262,31 @@ class TentacleBlob:
             self.y = SCREEN_HEIGHT - self.radius
             self.dy *= -1
 
-        # Update tentacle lengths
-        for i in range(self.num_tentacles):
-            # Use sine wave to smoothly vary length
-            self.growth_phases[i] += self.growth_speeds[i]
-            self.length_modifiers[i] = (
-                ((self.max_length_factor - self.min_length_factor) / 2) *
-                math.sin(self.growth_phases[i]) +
-                ((self.max_length_factor + self.min_length_factor) / 2)
-            )
-
-        # Update tentacle physics
-        self.tentacle_phase += self.tentacle_wiggle_speed
-        for i, tentacle in enumerate(self.tentacles):
-            # Update tentacle base position
-            tentacle['segments'][0] = (self.x, self.y)
+        # Update tentacle lengths, using a sine wave to smoothly vary length
+        self.growth_phases += self.growth_speeds
+        self.length_modifiers = (
+            ((self.max_length_factor - self.min_length_factor) / 2) *
+            np.sin(self.growth_phases) +
+            ((self.max_length_factor + self.min_length_factor) / 2)
+        )
 
-            # Calculate current tentacle length
-            current_length = self.base_tentacle_length * self.length_modifiers[i]
-            segment_length = current_length / self.tentacle_segments
+        # Update tentacle physics for all tentacles at once
+        self.tentacle_phase += self.tentacle_wiggle_speed
+        segment_lengths = self.base_tentacle_length * self.length_modifiers / self.tentacle_segments
+        wave = np.sin(self.tentacle_phase + self.segment_wave_offsets) * 0.3
+        angles = self.tentacle_angles[:, None] + wave[None, :]
+        self.tentacle_points[:, 0] = (self.x, self.y)
+        self.tentacle_points[:, 1:, 0] = self.x + np.cumsum(np.cos(angles) * segment_lengths[:, None], axis=1)
+        self.tentacle_points[:, 1:, 1] = self.y + np.cumsum(np.sin(angles) * segment_lengths[:, None], axis=1)
 
-            # Update each segment with wave motion
-            for j in range(1, self.tentacle_segments):
-                prev_x, prev_y = tentacle['segments'][j-1]
-                angle = tentacle['angle'] + math.sin(self.tentacle_phase + j * 0.5) * 0.3
-                new_x = prev_x + math.cos(angle) * segment_length
-                new_y = prev_y + math.sin(angle) * segment_length
-                tentacle['segments'][j] = (new_x, new_y)
+        # Rotate tentacle base angles for next frame
+        self.tentacle_angles += 0.02
 
-            # Rotate tentacle base angle for next frame
-            tentacle['angle'] += 0.02
+        # Update flash timer
+        if self.is_flashing:
+            self.flash_timer -= 1
+            if self.flash_timer <= 0:
+                self.is_flashing = False
 
     def flash(self):
         """Start flash effect"""
@@ -798,21 +1294,26 @@ class TentacleBlob:
         self.flash_timer = self.flash_duration
 
     def draw(self, screen):
+        # Tentacles reach far past the body, so cull on their joints
+        low = self.tentacle_points.min(axis=(0, 1))
+        high = self.tentacle_points.max(axis=(0, 1))
+        pad = max(self.radius, self.tentacle_thickness)
+        if not on_screen(low[0] - pad, low[1] - pad, (0, 0, high[0] - low[0] + 2 * pad, high[1] - low[1] + 2 * pad)):
+            return
+
         # Get current color based on flash state
         current_color = (255, 255, 255) if self.is_flashing else self.color
-        current_glow = (255, 255, 255) if self.is_flashing else self.glow_color
-
-        # Draw glow
-        pygame.draw.circle(screen, current_glow, (int(self.x), int(self.y)), self.radius + 2)
 
         # Draw main body
-        pygame.draw.circle(screen, current_color, (int(self.x), int(self.y)), self.radius)
-
-        # Draw tentacles
-        for tentacle in self.tentacles:
-            for i in range(1, len(tentacle['segments'])):
-                start = tentacle['segments'][i-1]
-                end = tentacle['segments'][i]
+        pygame.draw.circle(screen, current_color, view.point(self.x, self.y), self.radius * view.scale)
+
+        # Draw tentacles, joining every other joint when detail is reduced
+        step = 2 if governor.tier >= QUALITY_REDUCED_DETAIL else 1
+        thickness = view.width(self.tentacle_thickness)
+        for segments in (self.tentacle_points * view.scale).tolist():
+            for i in range(step, len(segments), step):
+                start = segments[i-step]
+                end = segments[i]
                 # Gradient color from body to tip
                 if self.is_flashing:
                     segment_color = (255, 255, 255)  # White when flashing
@@ -823,13 +1324,7 @@ class TentacleBlob:
                         int(self.color[1] * color_factor),
                         int(self.color[2] * color_factor)
                     )
-                pygame.draw.line(screen, segment_color, start, end, self.tentacle_thickness)
-
-        # Update flash timer
-        if self.is_flashing:
-            self.flash_timer -= 1
-            if self.flash_timer <= 0:
-                self.is_flashing = False
+                pygame.draw.line(screen, segment_color, start, end, thickness)
 
     def get_rect(self):
         # Return rect for main body collision
@@ -839,10 +1334,10 @@ class TentacleBlob:
     def get_tentacle_rects(self):
         # Return list of rects for tentacle segment collisions
         tentacle_rects = []
-        for tentacle in self.tentacles:
-            for i in range(1, len(tentacle['segments'])):
-                x1, y1 = tentacle['segments'][i-1]
-                x2, y2 = tentacle['segments'][i]
+        for segments in self.tentacle_points.tolist():
+            for i in range(1, len(segments)):
+                x1, y1 = segments[i-1]
+                x2, y2 = segments[i]
                 # Create a small rect for each segment
                 rect_x = min(x1, x2)
                 rect_y = min(y1, y2)
@@ -851,60 +1346,273 @@ class TentacleBlob:
                 tentacle_rects.append(pygame.Rect(rect_x, rect_y, rect_w, rect_h))
         return tentacle_rects
 
-class Enemy:
-    def __init__(self):
-        self.x = SCREEN_WIDTH
-        self.y = random.randint(50, SCREEN_HEIGHT - 50)
-        self.speed = random.randint(2, 5)
-        self.size = 20
-        self.color = (255, 0, 0)  # Red
-        self.eye_color = (255, 255, 255)  # White
-        self.pupil_color = (0, 0, 0)  # Black
-        self.eye_size = 6  # Size of the white part
-        self.pupil_size = 4  # Size of the black pupil
-        self.eye_spacing = 8  # Distance between eyes
-
-        # Pupil animation properties
-        self.pupil_offset = 0
-        self.pupil_direction = 1  # 1 for right, -1 for left
-        self.pupil_max_offset = 2  # Maximum pixels to move left/right
-        self.pupil_speed = 0.05  # Speed of pupil movement
+class Archetype:
+    """One kind of entity stored as parallel NumPy columns, one row per entity.
 
-    def update(self):
-        self.x -= self.speed
+    Systems update whole columns at once (enemies.x -= enemies.speed) instead
+    of calling a method per object. Every row also gets a unique eid and an
+    alive flag. kill() only clears the flag, so row indices stay valid while a
+    tick resolves collisions; compact() then drops the dead rows. Code reading
+    the columns between compactions should respect alive.
+    """
+    next_eid = 0
 
-        # Update pupil animation
-        self.pupil_offset += self.pupil_speed * self.pupil_direction
-        if abs(self.pupil_offset) >= self.pupil_max_offset:
-            self.pupil_direction *= -1  # Reverse direction at max offset
+    def __init__(self, capacity=16, **columns):
+        columns = dict(eid=np.int64, alive=bool, **columns)
+        self.__dict__['columns'] = {name: np.zeros(capacity, dtype) for name, dtype in columns.items()}
+        self.__dict__['count'] = 0
 
-    def draw(self, screen):
-        # Draw the main body
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+    def __len__(self):
+        return self.count
 
-        # Draw eyes
-        eye_spacing = 8
-        pygame.draw.circle(screen, self.eye_color, (int(self.x - eye_spacing), int(self.y - 2)), self.eye_size)
-        pygame.draw.circle(screen, self.eye_color, (int(self.x + eye_spacing), int(self.y - 2)), self.eye_size)
-
-        # Draw animated pupils
-        pygame.draw.circle(screen, self.pupil_color,
-                         (int(self.x - eye_spacing + self.pupil_offset), int(self.y - 2)), self.pupil_size)
-        pygame.draw.circle(screen, self.pupil_color,
-                         (int(self.x + eye_spacing + self.pupil_offset), int(self.y - 2)), self.pupil_size)
-
-    def get_rect(self):
-        """Get enemy's collision rectangle, slightly smaller than visual size"""
-        collision_size = self.size * 0.8  # Make collision box 80% of visual size
-        return pygame.Rect(self.x - collision_size, self.y - collision_size,
-                         collision_size * 2, collision_size * 2)
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name][:self.__dict__['count']]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def view(self, *names):
+        """Live slices of several columns at once, cheaper than one attribute read each"""
+        columns, count = self.__dict__['columns'], self.__dict__['count']
+        return [columns[name][:count] for name in names]
+
+    def __setattr__(self, name, value):
+        if name in self.columns:
+            self.columns[name][:self.count] = value
+        else:
+            self.__dict__[name] = value
+
+    def spawn(self, **values):
+        """Append one entity; columns not given start at zero. Returns its row"""
+        return self.spawn_many(1, **values)
+
+    def spawn_many(self, n, **values):
+        """Append n entities; values are scalars or length n arrays. Returns the first row"""
+        start, end = self.count, self.count + n
+        capacity = len(self.columns['eid'])
+        if end > capacity:
+            capacity = max(end, 2 * capacity)
+            for name, column in self.columns.items():
+                self.columns[name] = np.concatenate([column, np.zeros(capacity - len(column), column.dtype)])
+        for name, column in self.columns.items():
+            column[start:end] = values.get(name, 0)
+        self.columns['eid'][start:end] = np.arange(Archetype.next_eid, Archetype.next_eid + n)
+        self.columns['alive'][start:end] = True
+        Archetype.next_eid += n
+        self.count = end
+        return start
+
+    def kill(self, rows):
+        self.alive[rows] = False
+
+    def compact(self):
+        """Drop dead rows, keeping the order of the living"""
+        alive = self.alive.copy()  # The flag column itself is compacted below
+        if alive.all():
+            return
+        living = int(np.count_nonzero(alive))
+        for column in self.columns.values():
+            column[:living] = column[:self.count][alive]
+        self.count = living
+
+def make_enemies():
+    return Archetype(x=float, y=float, speed=float, pupil_offset=float, pupil_direction=float)
+
+def spawn_enemy(enemies, rng=random):
+    enemies.spawn(x=SCREEN_WIDTH, y=rng.randint(50, SCREEN_HEIGHT - 50),
+                  speed=rng.randint(2, 5), pupil_direction=1)
+
+def formation(wave):
+    """Offsets (dx, dy) of every enemy in a wave's formation"""
+    n = wave['count']
+    spacing = wave.get('spacing', 40)
+    i = np.arange(n)
+    shape = wave['formation']
+    if shape == 'grid':
+        # Columns of `rows` enemies, filled front to back
+        rows = wave.get('rows', 5)
+        return i // rows * spacing, (i % rows - (min(rows, n) - 1) / 2) * spacing
+    if shape == 'v':
+        # Leader in front, the rest alternating along two trailing arms
+        arm = (i + 1) // 2
+        return arm * spacing, np.where(i % 2, -1, 1) * arm * spacing
+    if shape == 'sine':
+        return i * spacing, wave.get('amplitude', 60) * np.sin(i * 0.5)
+    raise ValueError(f"Unknown formation {shape!r}")
+
+def spawn_wave(enemies, wave, rng=random):
+    """Spawn a wave's formation just off the right edge, moving as one"""
+    dx, dy = formation(wave)
+    # Place it at a random height that keeps the whole formation on screen
+    low = 50 - dy.min()
+    high = SCREEN_HEIGHT - 50 - dy.max()
+    y = rng.uniform(low, high) if low <= high else SCREEN_HEIGHT / 2 - (dy.min() + dy.max()) / 2
+    speed = wave.get('speed') or rng.randint(2, 5)
+    enemies.spawn_many(len(dx), x=SCREEN_WIDTH + ENEMY_SIZE + dx, y=y + dy,
+                       speed=speed, pupil_direction=1)
+
+def update_enemies(enemies):
+    """Move every enemy, swing the pupils and drop the ones that left the screen"""
+    enemies.x -= enemies.speed
+
+    # Pupils drift 0.05 px a tick and reverse at 2 px either side
+    enemies.pupil_offset += 0.05 * enemies.pupil_direction
+    enemies.pupil_direction = np.where(np.abs(enemies.pupil_offset) >= 2,
+                                       -enemies.pupil_direction, enemies.pupil_direction)
+
+    enemies.kill(enemies.x + ENEMY_SIZE < 0)
+    enemies.compact()
+
+def enemy_rects(enemies):
+    """Collision boxes of every enemy as (x, y, width, height) rows"""
+    rects = np.empty((len(enemies), 4))
+    # Truncated like pygame.Rect so results match per-object rect checks
+    rects[:, 0] = np.trunc(enemies.x - ENEMY_HITBOX)
+    rects[:, 1] = np.trunc(enemies.y - ENEMY_HITBOX)
+    rects[:, 2:] = int(ENEMY_HITBOX * 2)
+    return rects
+
+def rects_overlap(rect, rects):
+    """Which rows of rects overlap rect, with pygame.Rect.colliderect rules"""
+    x, y, width, height = rect
+    return ((rects[:, 0] < x + width) & (x < rects[:, 0] + rects[:, 2]) &
+            (rects[:, 1] < y + height) & (y < rects[:, 1] + rects[:, 3]) &
+            (rects[:, 2] > 0) & (rects[:, 3] > 0) & (width > 0) & (height > 0))
+
+# Pixel collision masks by sprite kind, each (mask, position of the sprite's
+# centre in the mask). Built once on first use, never per frame.
+SPRITE_MASKS = {}
+
+def sprite_silhouette(kind):
+    """Surface with the collidable pixels of a sprite, and where its centre is"""
+    if kind == 'bird':
+        # Body and triangular ears as drawn by Bird.draw
+        radius, ear_size, ear_spacing = Bird.radius, Bird.ear_size, Bird.ear_spacing
+        centre = (radius, radius + ear_size // 2)
+        surface = pygame.Surface((radius * 2 + 1, centre[1] + radius + 1), pygame.SRCALPHA)
+        for ear_x in (radius - ear_spacing // 2, radius + ear_spacing // 2):
+            pygame.draw.polygon(surface, WHITE, [(ear_x, 0), (ear_x - ear_size // 2, ear_size),
+                                                 (ear_x + ear_size // 2, ear_size)])
+    elif kind in ('enemy', 'powerup'):
+        radius = ENEMY_SIZE if kind == 'enemy' else PowerUp.size
+        centre = (radius, radius)
+        surface = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+    else:
+        raise ValueError(f"No silhouette for {kind!r}")
+    pygame.draw.circle(surface, WHITE, centre, radius)
+    return surface, centre
+
+def sprite_mask(kind):
+    if kind not in SPRITE_MASKS:
+        surface, centre = sprite_silhouette(kind)
+        SPRITE_MASKS[kind] = (pygame.mask.from_surface(surface), centre)
+    return SPRITE_MASKS[kind]
+
+def sprite_hits(kind, x, y, other, xs, ys):
+    """Indices of the `other` sprites centred at xs, ys whose pixels touch the
+    `kind` sprite centred at (x, y).
+
+    A bounding box test over all of them runs first; only the boxes that
+    overlap get the (much dearer) mask test.
+    """
+    mask, (cx, cy) = sprite_mask(kind)
+    other_mask, (ox, oy) = sprite_mask(other)
+    # Truncated like the int() positions the sprites are drawn at
+    left, top = int(x) - cx, int(y) - cy
+    lefts = np.asarray(xs, dtype=float).astype(int) - ox
+    tops = np.asarray(ys, dtype=float).astype(int) - oy
+    width, height = mask.get_size()
+    other_width, other_height = other_mask.get_size()
+    near = ((lefts < left + width) & (left < lefts + other_width) &
+            (tops < top + height) & (top < tops + other_height))
+    return [i for i in np.flatnonzero(near).tolist()
+            if mask.overlap(other_mask, (int(lefts[i]) - left, int(tops[i]) - top))]
+
+# Drawn looks of sprite kinds by (kind, look, render scale), each (surface,
+# pixel offset of the anchor in it). Painted once, then only ever blitted.
+SPRITES = {}
+SPRITE_COLORKEY = (255, 0, 254)  # Transparent in sprites; no sprite uses it
+
+def sprite(kind, look, bounds, paint):
+    """Cached surface for one look of a sprite kind and where its anchor is.
+
+    bounds is (left, top, width, height) around the anchor in world units;
+    paint(surface, x, y) draws the sprite with its anchor at world (x, y).
+    """
+    key = (kind, look, view.scale)
+    if key not in SPRITES:
+        left, top, width, height = bounds
+        surface = pygame.Surface((math.ceil(width * view.scale), math.ceil(height * view.scale)))
+        surface.fill(SPRITE_COLORKEY)
+        paint(surface, -left, -top)
+        surface.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+        SPRITES[key] = (surface, view.point(-left, -top))
+    return SPRITES[key]
+
+def on_screen(x, y, bounds):
+    """Whether bounds around (x, y) overlap the world; x and y may be arrays"""
+    left, top, width, height = bounds
+    return ((x + left + width > 0) & (x + left < SCREEN_WIDTH) &
+            (y + top + height > 0) & (y + top < SCREEN_HEIGHT))
+
+def sprite_blits(kind, bounds, paint, xs, ys, looks):
+    """(surface, position) blits of the visible ones among many sprites of a kind.
+
+    xs, ys and looks are arrays; paint(surface, x, y, look) draws one look.
+    """
+    shown = on_screen(xs, ys, bounds)
+    s = view.scale
+    blits = []
+    for x, y, look in zip((xs[shown] * s).astype(int).tolist(), (ys[shown] * s).astype(int).tolist(),
+                          looks[shown].tolist()):
+        surface, (ox, oy) = sprite(kind, look, bounds,
+                                   lambda surface, x, y, look=look: paint(surface, x, y, look))
+        blits.append((surface, (x - ox, y - oy)))
+    return blits
+
+def entity_blits(entities, current_time):
+    """(surface, position) blits of the visible ones among sprite objects.
+
+    Each has x, y, bounds, look(current_time), a hashable summary of how it
+    looks right now, and paint(surface, x, y, look) to draw a look.
+    """
+    blits = []
+    for entity in entities:
+        if on_screen(entity.x, entity.y, entity.bounds):
+            look = entity.look(current_time)
+            surface, (ox, oy) = sprite(type(entity).__name__, look, entity.bounds,
+                                       lambda surface, x, y: entity.paint(surface, x, y, look))
+            x, y = view.point(entity.x, entity.y)
+            blits.append((surface, (x - ox, y - oy)))
+    return blits
+
+ENEMY_BOUNDS = (-ENEMY_SIZE - 1, -ENEMY_SIZE - 1, 2 * ENEMY_SIZE + 2, 2 * ENEMY_SIZE + 2)
+
+def paint_enemy(surface, x, y, pupil):
+    """Body, white eyes and black pupils shifted `pupil` pixels"""
+    s = view.scale
+    x, y = view.point(x, y)
+    eye_spacing = 8 * s
+    eye_y = 2 * s
+    pygame.draw.circle(surface, RED, (x, y), ENEMY_SIZE * s)
+    pygame.draw.circle(surface, WHITE, (x - eye_spacing, y - eye_y), 6 * s)
+    pygame.draw.circle(surface, WHITE, (x + eye_spacing, y - eye_y), 6 * s)
+    pygame.draw.circle(surface, BLACK, (int(x - eye_spacing + pupil), y - eye_y), 4 * s)
+    pygame.draw.circle(surface, BLACK, (int(x + eye_spacing + pupil), y - eye_y), 4 * s)
+
+def enemy_blits(enemies):
+    # One look per whole pixel of pupil swing; rounding first absorbs the
+    # float drift of the 0.05 px steps
+    pupils = np.floor(np.round(enemies.pupil_offset * view.scale, 6)).astype(int)
+    live = enemies.alive
+    return sprite_blits('enemy', ENEMY_BOUNDS, paint_enemy, enemies.x[live], enemies.y[live], pupils[live])
 
 class Gate:
-    def __init__(self):
+    def __init__(self, y=None):
         self.width = 30
         self.height = 100
         self.x = SCREEN_WIDTH
-        self.y = random.randint(self.height, SCREEN_HEIGHT - self.height)
+        self.y = y if y is not None else random.randint(self.height, SCREEN_HEIGHT - self.height)
         self.speed = 3
         self.health = 4  # Takes 4 hits to destroy
         self.max_health = 4
@@ -912,74 +1620,93 @@ class Gate:
         self.flash_start = 0
         self.flash_duration = 200  # Flash for 200ms when hit
 
-    def hit(self, damage, current_time):
+    def hit(self, damage, current_time, particles):
         self.health -= damage
         self.flash_start = current_time
         if self.health <= 0:
             self.destroyed = True
-            enemy_death_sound.play()  # Play explosion sound when destroyed
+            enemy_death_sound.play(x=self.x)  # Play explosion sound when destroyed
+            particles.burst(self.x + self.width / 2, self.y + self.height / 2, 60, (255, 165, 0), speed=4)
             return True
-        hit_sound.play()  # Play hit sound when damaged but not destroyed
+        hit_sound.play(x=self.x)  # Play hit sound when damaged but not destroyed
+        particles.burst(self.x, self.y + self.height / 2, 10, (255, 165, 0), speed=2)
         return False
 
     def update(self):
         self.x -= self.speed
 
-    def draw(self, screen, current_time):
-        if not self.destroyed:
-            # Calculate color based on health
-            health_percentage = self.health / self.max_health
-            if current_time - self.flash_start < self.flash_duration:
-                # Flash white when hit
-                color = WHITE
-            else:
-                # Color goes from red (low health) to orange (full health)
-                red = 255
-                green = int(165 * health_percentage)
-                color = (red, green, 0)
-
-            # Draw the gate with a metallic effect
-            pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
-            # Draw health bars
-            for i in range(self.health):
-                bar_height = 5
-                bar_width = 20
-                bar_x = self.x + 5
-                bar_y = self.y + self.height - (i + 1) * (bar_height + 2) - 5
-                pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height))
+    @property
+    def bounds(self):
+        return (0, 0, self.width, self.height)
+
+    def look(self, current_time):
+        """Colour and remaining health"""
+        # Calculate color based on health
+        health_percentage = self.health / self.max_health
+        if current_time - self.flash_start < self.flash_duration:
+            # Flash white when hit
+            color = WHITE
+        else:
+            # Color goes from red (low health) to orange (full health)
+            red = 255
+            green = int(165 * health_percentage)
+            color = (red, green, 0)
+        return color, self.health
+
+    def paint(self, surface, x, y, look):
+        color, health = look
+        # Draw the gate with a metallic effect
+        pygame.draw.rect(surface, color, view.rect(x, y, self.width, self.height))
+        # Draw health bars
+        for i in range(health):
+            bar_height = 5
+            bar_width = 20
+            bar_x = x + 5
+            bar_y = y + self.height - (i + 1) * (bar_height + 2) - 5
+            pygame.draw.rect(surface, WHITE, view.rect(bar_x, bar_y, bar_width, bar_height))
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
-class Pipe:
-    def __init__(self):
-        self.width = PIPE_WIDTH
-        self.x = SCREEN_WIDTH
-        self.passed = False
-        self.gap_size = INITIAL_GAP_SIZE // 2  # Start with initial gap size
-        self.gap_y = random.randint(self.gap_size + 50, SCREEN_HEIGHT - self.gap_size - 50)
-
-    def update(self):
-        self.x -= PIPE_SPEED
-
-    def draw(self, screen):
-        # Draw top pipe
-        pygame.draw.rect(screen, GREY,
-                        (self.x, 0, self.width, self.gap_y - self.gap_size))
-        # Draw bottom pipe
-        pygame.draw.rect(screen, GREY,
-                        (self.x, self.gap_y + self.gap_size,
-                         self.width, SCREEN_HEIGHT - (self.gap_y + self.gap_size)))
+def make_pipes():
+    return Archetype(x=float, gap_y=float, gap_size=float, passed=bool)
+
+def update_pipes(pipes, bird_x):
+    """Move every pipe and drop those off screen. Returns how many the bird passed"""
+    pipes.x -= PIPE_SPEED
+    passed = ~pipes.passed & (pipes.x < bird_x)
+    pipes.passed |= passed
+    pipes.kill(pipes.x + PIPE_WIDTH < 0)
+    pipes.compact()
+    return int(np.count_nonzero(passed))
+
+def pipe_rects(pipes):
+    """Top and bottom pipe rects as (x, y, width, height) rows, tops first"""
+    n = len(pipes)
+    x = pipes.x
+    rects = np.empty((2 * n, 4))
+    rects[:n, 0] = x
+    rects[n:, 0] = x
+    rects[:, 2] = PIPE_WIDTH
+    rects[:n, 1] = 0
+    rects[:n, 3] = pipes.gap_y - pipes.gap_size
+    rects[n:, 1] = pipes.gap_y + pipes.gap_size
+    rects[n:, 3] = SCREEN_HEIGHT - (pipes.gap_y + pipes.gap_size)
+    return rects
+
+def draw_pipes(screen, pipes):
+    shown = np.tile(pipes.alive & (pipes.x < SCREEN_WIDTH) & (pipes.x + PIPE_WIDTH > 0), 2)
+    for rect in (pipe_rects(pipes)[shown] * view.scale).tolist():
+        pygame.draw.rect(screen, GREY, rect)
 
 class UFO:
-    def __init__(self, x=None, y=None):
+    def __init__(self, x=None, y=None, current_time=None):
         # Start position should be off-screen
-        self.x = SCREEN_WIDTH + 40
-        self.y = random.randint(50, SCREEN_HEIGHT//3)
+        self.x = x if x is not None else SCREEN_WIDTH + 40
+        self.y = y if y is not None else random.randint(50, SCREEN_HEIGHT//3)
         self.radius = 20
         self.health = 3
-        self.bullets = []
-        self.last_shot = pygame.time.get_ticks()
+        self.last_shot = pygame.time.get_ticks() if current_time is None else current_time
         self.shot_delay = 2000
         self.flash_timer = 0
         self.flash_interval = 30
@@ -991,9 +1718,7 @@ class UFO:
         self.movement_speed = 0.02
         self.entrance_speed = 2  # Constant entrance speed
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
-
+    def update(self, current_time, shots):
         # Move towards play area while doing pattern movement
         if self.x > self.target_x:
             self.x -= self.entrance_speed
@@ -1019,107 +1744,112 @@ class UFO:
 
         # Shoot at intervals once partially in screen
         if self.x < SCREEN_WIDTH - self.radius and current_time - self.last_shot > self.shot_delay:
-            self.shoot(50, SCREEN_HEIGHT // 2)
+            self.shoot(shots, 50, SCREEN_HEIGHT // 2)
             self.last_shot = current_time
 
-        # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
+        # Advance flash effect
+        self.flash_timer = (self.flash_timer + 1) % self.flash_interval
 
-    def shoot(self, target_x, target_y):
-        """Create a new bullet aimed at the target"""
-        bullet = UFOBullet(self.x, self.y, target_x, target_y)
-        self.bullets.append(bullet)
-        ufo_shoot_sound.play()
+    def shoot(self, shots, target_x, target_y):
+        """Fire a shot from the hostile pool at the target"""
+        fire_hostile_shot(shots, self.x, self.y, target_x, target_y)
+        ufo_shoot_sound.play(x=self.x)
 
-    def draw(self, screen):
+    @property
+    def bounds(self):
+        return (-self.radius - 1, -self.radius - 1, 2 * self.radius + 2, 2 * self.radius + 2)
+
+    def look(self, current_time):
+        """Whether the lights are in the bright half of their flash"""
+        return self.flash_timer < self.flash_interval // 2
+
+    def paint(self, surface, x, y, flashing):
         # Flash effect
-        self.flash_timer = (self.flash_timer + 1) % self.flash_interval
         flash_color = (192, 192, 192)  # Base silver color
-        if self.flash_timer < self.flash_interval // 2:
+        if flashing:
             flash_color = (255, 255, 200)  # Bright yellow-white flash
 
         # Draw UFO body
-        pygame.draw.circle(screen, flash_color, (int(self.x), int(self.y)), self.radius)
+        pygame.draw.circle(surface, flash_color, view.point(x, y), self.radius * view.scale)
 
         # Draw UFO dome
         dome_height = self.radius // 2
-        dome_rect = pygame.Rect(self.x - self.radius//2, self.y - dome_height,
+        dome_rect = view.rect(x - self.radius//2, y - dome_height,
                               self.radius, dome_height)
-        pygame.draw.ellipse(screen, flash_color, dome_rect)
+        pygame.draw.ellipse(surface, flash_color, dome_rect)
 
         # Draw horizontal visor line (full width of UFO)
         visor_width = self.radius * 2  # Full width of UFO
         visor_height = 2  # 2 pixels thick
-        visor_x = self.x - visor_width // 2
-        visor_y = self.y - visor_height // 2
-        pygame.draw.rect(screen, (0, 128, 255),  # Blue visor
-                        (visor_x, visor_y, visor_width, visor_height))
-
-        # Add visor glow (full width)
-        glow_height = 1  # 1 pixel glow above and below
-        pygame.draw.rect(screen, (128, 200, 255),  # Light blue glow
-                        (visor_x, visor_y - glow_height, visor_width, glow_height))
-        pygame.draw.rect(screen, (128, 200, 255),  # Light blue glow
-                        (visor_x, visor_y + visor_height, visor_width, glow_height))
+        visor_x = x - visor_width // 2
+        visor_y = y - visor_height // 2
+        pygame.draw.rect(surface, (0, 128, 255),  # Blue visor
+                        view.rect(visor_x, visor_y, visor_width, visor_height))
 
         # Draw small mouth (frowning curve) - lower and inverted
         mouth_width = self.radius * 0.3
-        mouth_y = self.y + self.radius * 0.4  # Moved down from 0.2 to 0.4
+        mouth_y = y + self.radius * 0.4  # Moved down from 0.2 to 0.4
         mouth_points = [
-            (self.x - mouth_width//2, mouth_y),
-            (self.x, mouth_y - 2),  # Center point slightly higher for frown
-            (self.x + mouth_width//2, mouth_y)
+            view.point(x - mouth_width//2, mouth_y),
+            view.point(x, mouth_y - 2),  # Center point slightly higher for frown
+            view.point(x + mouth_width//2, mouth_y)
         ]
-        pygame.draw.lines(screen, (50, 50, 50), False, mouth_points, 2)
+        pygame.draw.lines(surface, (50, 50, 50), False, mouth_points, view.width(2))
 
         # Draw UFO lights with flashing effect
         light_radius = 3
-        light_color = (255, 255, 0) if self.flash_timer < self.flash_interval // 2 else (255, 150, 0)
+        light_color = (255, 255, 0) if flashing else (255, 150, 0)
         for i in range(4):
             angle = i * math.pi / 2
-            light_x = self.x + (self.radius - light_radius) * math.cos(angle)
-            light_y = self.y + (self.radius - light_radius) * math.sin(angle)
-            pygame.draw.circle(screen, light_color, (int(light_x), int(light_y)), light_radius)
-
-        # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(screen)
-
-class UFOBullet:
-    def __init__(self, x, y, target_x, target_y):
-        self.x = x
-        self.y = y
-        # Calculate direction towards target
-        angle = math.atan2(target_y - y, target_x - x)
-        speed = 5
-        self.dx = math.cos(angle) * speed
-        self.dy = math.sin(angle) * speed
-        self.radius = 3
-        self.color = (255, 0, 0)  # Red bullets
-
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-
-    def is_off_screen(self):
-        return (self.x < 0 or self.x > SCREEN_WIDTH or
-                self.y < 0 or self.y > SCREEN_HEIGHT)
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-
-    def get_rect(self):
-        return pygame.Rect(self.x - self.radius, self.y - self.radius,
-                         self.radius * 2, self.radius * 2)
+            light_x = x + (self.radius - light_radius) * math.cos(angle)
+            light_y = y + (self.radius - light_radius) * math.sin(angle)
+            pygame.draw.circle(surface, light_color, view.point(light_x, light_y), light_radius * view.scale)
+
+def make_hostile_shots():
+    """The pool every hostile projectile lives in, whoever fired it"""
+    return Archetype(64, x=float, y=float, prev_x=float, prev_y=float, dx=float, dy=float)
+
+def fire_hostile_shot(shots, x, y, target_x, target_y):
+    angle = math.atan2(target_y - y, target_x - x)
+    shots.spawn(x=x, y=y, prev_x=x, prev_y=y,
+                dx=math.cos(angle) * HOSTILE_SHOT_SPEED, dy=math.sin(angle) * HOSTILE_SHOT_SPEED)
+
+def update_hostile_shots(shots):
+    """Move every hostile shot once and drop those that left the screen"""
+    shots.prev_x = shots.x
+    shots.prev_y = shots.y
+    shots.x += shots.dx
+    shots.y += shots.dy
+    shots.kill((shots.x < 0) | (shots.x > SCREEN_WIDTH) | (shots.y < 0) | (shots.y > SCREEN_HEIGHT))
+    shots.compact()
+
+def hostile_shot_hits(shots, rect):
+    """Rows of the shots whose last move crossed rect, as one swept query"""
+    start = np.column_stack([shots.prev_x, shots.prev_y]) - HOSTILE_SHOT_RADIUS
+    end = np.column_stack([shots.x, shots.y]) - HOSTILE_SHOT_RADIUS
+    sizes = np.full((len(shots), 2), HOSTILE_SHOT_RADIUS * 2.0)
+    times = swept_rect_hits(start, end, sizes, np.array([rect], dtype=float))
+    return np.flatnonzero(np.isfinite(times[:, 0]) & shots.alive)
+
+HOSTILE_SHOT_BOUNDS = (-HOSTILE_SHOT_RADIUS - 1, -HOSTILE_SHOT_RADIUS - 1,
+                       2 * HOSTILE_SHOT_RADIUS + 2, 2 * HOSTILE_SHOT_RADIUS + 2)
+
+def paint_hostile_shot(surface, x, y, look):
+    pygame.draw.circle(surface, RED, view.point(x, y), HOSTILE_SHOT_RADIUS * view.scale)
+
+def hostile_shot_blits(shots):
+    live = shots.alive
+    return sprite_blits('hostile_shot', HOSTILE_SHOT_BOUNDS, paint_hostile_shot,
+                        shots.x[live], shots.y[live], np.zeros(int(np.count_nonzero(live)), int))
 
 class Explosion:
-    def __init__(self, x, y, radius=400):  # Doubled the radius from 200 to 400
+    def __init__(self, x, y, radius=400, damage=NUKE_DAMAGE, expanding=None):  # Doubled the radius from 200 to 400
         self.x = x
         self.y = y
         self.radius = radius
+        self.damage = damage
+        self.expanding = NUKE_EXPANDING_BLAST if expanding is None else expanding
+        self.damaged = set()  # Already hit by this blast: ('enemy', eid) keys and UFO, blob and gate objects
         self.current_radius = 0
         self.max_alpha = 200  # Increased alpha for more visible explosion
         self.current_alpha = self.max_alpha
@@ -1138,53 +1868,269 @@ class Explosion:
                 self.is_finished = True
 
     def draw(self, screen):
+        s = view.scale
+        if governor.tier >= QUALITY_MINIMAL:
+            # Outline only, straight onto the screen without alpha layers
+            pygame.draw.circle(screen, (255, 165, 0), view.point(self.x, self.y),
+                               int(self.current_radius * s), view.width(3))
+            return
+
         # Draw outer explosion circle (orange)
-        outer_surface = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
+        radius = int(self.radius * s)
+        outer_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
         pygame.draw.circle(outer_surface, (255, 165, 0, self.current_alpha),
-                         (self.radius, self.radius), self.current_radius)
+                         (radius, radius), self.current_radius * s)
 
         # Draw inner explosion circle (bright yellow)
-        inner_radius = self.current_radius * 0.7
+        inner_radius = self.current_radius * 0.7 * s
         pygame.draw.circle(outer_surface, (255, 255, 200, self.current_alpha),
-                         (self.radius, self.radius), inner_radius)
+                         (radius, radius), inner_radius)
 
         # Draw core (white)
-        core_radius = self.current_radius * 0.3
+        core_radius = self.current_radius * 0.3 * s
         pygame.draw.circle(outer_surface, (255, 255, 255, self.current_alpha),
-                         (self.radius, self.radius), core_radius)
+                         (radius, radius), core_radius)
 
         # Draw to screen
         screen.blit(outer_surface,
-                   (self.x - self.radius, self.y - self.radius))
-
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT)
-        # Fainter stars: brightness between 50 and 150 (darker grey to light grey)
-        brightness = random.randint(50, 150)
-        self.color = (brightness, brightness, brightness)
-        # Smaller stars: size between 1 and 2 pixels only
-        self.size = random.randint(1, 2)
-        # Even slower movement
-        self.speed = random.uniform(0.1, 0.3)
+                   ((self.x - self.radius) * s, (self.y - self.radius) * s))
+
+class ParticleSystem:
+    """Sparks for hits, deaths and explosions, in one preallocated NumPy array.
+
+    Each row is a field (x, y, dx, dy, life, max life, r, g, b) and each
+    column a particle, so every field is contiguous; the live particles are
+    the first `count` columns. burst() fills the next columns in one slice,
+    update() integrates every particle at once and compacts the expired ones
+    away, and draw() writes them straight into the screen's pixels, so there
+    is no Python object or draw call per particle.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.state = np.zeros((9, capacity), np.float32)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def burst(self, x, y, count, color, speed=3.0, life=30):
+        """Emit count particles in all directions from (x, y); x and y may be arrays of origins"""
+        if governor.tier >= QUALITY_REDUCED_DETAIL:
+            count = max(1, count // 2)
+        origins = np.column_stack(np.broadcast_arrays(np.atleast_1d(x), np.atleast_1d(y)))
+        n = min(len(origins) * count, self.state.shape[1] - self.count)
+        if n <= 0:
+            return
+        new = self.state[:, self.count:self.count + n]
+        new[0:2] = np.repeat(origins, count, axis=0)[:n].T
+        angle = np.random.uniform(0, 2 * math.pi, n)
+        magnitude = speed * np.random.uniform(0.2, 1.0, n)
+        new[2] = np.cos(angle) * magnitude
+        new[3] = np.sin(angle) * magnitude
+        new[4] = new[5] = life * np.random.uniform(0.5, 1.0, n)
+        # Some sparks are tinted towards white
+        color = np.asarray(color, np.float32)[:, None]
+        new[6:9] = color + (255 - color) * np.random.uniform(0, 0.5, n)
+        self.count += n
 
     def update(self):
-        self.x -= self.speed
-        if self.x < 0:
-            self.x = SCREEN_WIDTH
-            self.y = random.randint(0, SCREEN_HEIGHT)
-            # New random brightness when recycling star
-            brightness = random.randint(50, 150)
-            self.color = (brightness, brightness, brightness)
+        live = self.state[:, :self.count]
+        live[2:4] *= PARTICLE_DRAG
+        live[0:2] += live[2:4]
+        live[4] -= 1
+        alive = live[4] > 0
+        if not alive.all():
+            n = int(np.count_nonzero(alive))
+            for field in live:  # Field by field is faster than one 2D selection
+                field[:n] = field[alive]
+            self.count = n
+
+    def clear(self):
+        self.count = 0
 
     def draw(self, screen):
-        # For smallest stars, just set a pixel
-        if self.size == 1:
-            screen.set_at((int(self.x), int(self.y)), self.color)
+        if not self.count:
+            return
+        live = self.state[:, :self.count]
+        x = (live[0] * view.scale).astype(np.intp)
+        y = (live[1] * view.scale).astype(np.intp)
+        width, height = screen.get_size()
+        visible = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        x, y = x[visible], y[visible]
+        # Fade out over the lifetime
+        colors = [channel[visible] for channel in (live[6:9] * (live[4] / live[5])).astype(np.uint32)]
+
+        # Lighten so sparks never darken the scene. 32-bit surfaces are done
+        # on packed pixels through a flat view, much cheaper than indexing
+        # three channel planes.
+        if screen.get_bytesize() != 4:
+            pixels = pygame.surfarray.pixels3d(screen)
+            pixels[x, y] = np.maximum(pixels[x, y], np.column_stack(colors))
+            del pixels  # Unlock the surface
+            return
+        buffer = screen.get_buffer()
+        pixels = np.frombuffer(buffer, np.uint32)
+        index = y * (screen.get_pitch() // 4) + x
+        old = pixels[index]
+        packed = old
+        for channel, shift in enumerate(screen.get_shifts()[:3]):
+            brighter = np.maximum((old >> shift) & 0xFF, colors[channel])
+            packed = (packed & ~np.uint32(0xFF << shift)) | (brighter << np.uint32(shift))
+        pixels[index] = packed
+        del pixels, buffer  # Unlock the surface
+
+# Normalised Gaussian taps out to three sigma
+_bloom_taps = np.arange(-math.ceil(3 * BLOOM_SIGMA), math.ceil(3 * BLOOM_SIGMA) + 1)
+BLOOM_KERNEL = np.exp(-0.5 * (_bloom_taps / BLOOM_SIGMA) ** 2).astype(np.float32)
+BLOOM_KERNEL /= BLOOM_KERNEL.sum()
+
+def blur_axis(image, kernel, axis):
+    """Convolve image with a 1D kernel along one axis, zero beyond the edges"""
+    radius = len(kernel) // 2
+    padding = [(0, 0)] * image.ndim
+    padding[axis] = (radius, radius)
+    padded = np.pad(image, padding)
+    length = image.shape[axis]
+    window = [slice(None)] * image.ndim
+    out = np.zeros_like(image)
+    term = np.empty_like(image)
+    for offset, weight in enumerate(kernel):
+        window[axis] = slice(offset, offset + length)
+        np.multiply(padded[tuple(window)], weight, out=term)
+        out += term
+    return out
+
+class Bloom:
+    """Full-screen glow: the bright parts of the frame, blurred and added back.
+
+    Brightness above BLOOM_THRESHOLD is kept with a saturating subtract, the
+    result is shrunk to the world size over BLOOM_DOWNSAMPLE, blurred with a
+    separable Gaussian in NumPy and scaled back up onto the frame additively.
+    The cost depends on the frame size only, not on how many things glow, and
+    the blur itself is the same at every render scale. Work surfaces are
+    reused between frames.
+    """
+    def __init__(self):
+        self.size = None
+
+    def setup(self, screen):
+        self.size = screen.get_size()
+        self.small_size = (SCREEN_WIDTH // BLOOM_DOWNSAMPLE, SCREEN_HEIGHT // BLOOM_DOWNSAMPLE)
+        self.bright = screen.copy()
+        # Subtracting a flat surface is far quicker than a subtractive fill
+        self.threshold = screen.copy()
+        self.threshold.fill((BLOOM_THRESHOLD,) * 3)
+        self.small = pygame.Surface(self.small_size, 0, screen)
+        self.glow = screen.copy()
+
+    def apply(self, screen):
+        if screen.get_size() != self.size:
+            self.setup(screen)
+        self.bright.blit(screen, (0, 0))
+        self.bright.blit(self.threshold, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+        pygame.transform.smoothscale(self.bright, self.small_size, self.small)
+
+        pixels = pygame.surfarray.pixels3d(self.small)
+        image = pixels.astype(np.float32, order='C')  # pixels3d is strided oddly
+        blurred = blur_axis(blur_axis(image, BLOOM_KERNEL, 0), BLOOM_KERNEL, 1)
+        pixels[...] = np.minimum(blurred * BLOOM_STRENGTH, 255)
+        del pixels  # Unlock the surface
+
+        pygame.transform.smoothscale(self.small, self.size, self.glow)
+        screen.blit(self.glow, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+bloom = Bloom()
+
+def apply_blast(explosion, radius, enemies, ufos, gates, blobs, particles, current_time):
+    """Damage every entity within radius of the explosion, scaled by distance.
+
+    Entities already hit by this explosion are skipped, so this can be called
+    every tick with the growing shock wave radius. Killed entities are removed
+    (enemies are killed in their archetype, gates are marked destroyed).
+    Returns the number of entities killed.
+    """
+    killed = 0
+
+    # Enemies are tested as whole columns; each is one hit kill
+    distance = np.hypot(enemies.x - explosion.x, enemies.y - explosion.y)
+    in_blast = enemies.alive & (distance - ENEMY_SIZE <= radius)
+    dead = []
+    for row in np.flatnonzero(in_blast):
+        key = ('enemy', int(enemies.eid[row]))
+        if key not in explosion.damaged:
+            explosion.damaged.add(key)
+            dead.append(row)
+    enemies.kill(dead)
+    particles.burst(enemies.x[dead], enemies.y[dead], 30, RED)
+    killed += len(dead)
+
+    # The few UFOs, blobs and gates get the same distance test, as circles
+    # around their centres; the blast remembers the objects it has hit
+    targets = [(entity, entity.x, entity.y, entity.radius) for entity in ufos + blobs
+               if entity not in explosion.damaged]
+    targets += [(gate, gate.x + gate.width / 2, gate.y + gate.height / 2, math.hypot(gate.width, gate.height) / 2)
+                for gate in gates if not gate.destroyed and gate not in explosion.damaged]
+    bounds = np.array([target[1:] for target in targets], dtype=float).reshape(-1, 3)
+    distances = np.hypot(bounds[:, 0] - explosion.x, bounds[:, 1] - explosion.y)
+    for i in np.flatnonzero(distances - bounds[:, 2] <= radius).tolist():
+        entity, distance = targets[i][0], distances[i]
+        explosion.damaged.add(entity)
+        falloff = max(0.0, 1 - distance / explosion.radius)
+        damage = max(1, round(explosion.damage * falloff))
+
+        if isinstance(entity, UFO):
+            entity.health -= damage
+            if entity.health <= 0:
+                ufos.remove(entity)
+                ufo_death_sound.play(x=entity.x)
+                particles.burst(entity.x, entity.y, 80, (255, 255, 200), speed=4)
+                killed += 1
+            else:
+                ufo_hit_sound.play(x=entity.x)
+                particles.burst(entity.x, entity.y, 12, (192, 192, 192), speed=2)
+        elif isinstance(entity, TentacleBlob):
+            entity.health -= damage
+            entity.flash()
+            if entity.health <= 0:
+                blobs.remove(entity)
+                particles.burst(entity.x, entity.y, 80, entity.color, speed=4)
+                killed += 1
+        elif isinstance(entity, Gate):
+            if entity.hit(damage, current_time, particles):
+                killed += 1
+
+    if killed and len(ufos) == 0:
+        ufo_presence_sound.stop()  # Stop UFO sound when all UFOs are destroyed
+    return killed
+
+def make_stars(n=NUM_STARS, rng=random):
+    stars = Archetype(n, x=float, y=float, speed=float, brightness=np.uint8, size=np.uint8)
+    for _ in range(n):
+        # Faint (grey 50-150), small (1-2 px) and slow
+        stars.spawn(x=rng.randint(0, SCREEN_WIDTH), y=rng.randint(0, SCREEN_HEIGHT),
+                    brightness=rng.randint(50, 150), size=rng.randint(1, 2),
+                    speed=rng.uniform(0.1, 0.3))
+    return stars
+
+def update_stars(stars):
+    """Scroll the starfield, recycling stars that leave on the left"""
+    stars.x -= stars.speed
+    wrapped = np.flatnonzero(stars.x < 0)
+    if len(wrapped):
+        stars.x[wrapped] = SCREEN_WIDTH
+        stars.y[wrapped] = np.random.randint(0, SCREEN_HEIGHT + 1, len(wrapped))
+        # New random brightness when recycling star
+        stars.brightness[wrapped] = np.random.randint(50, 151, len(wrapped))
+
+def draw_stars(screen, stars, step=1):
+    s = view.scale
+    for x, y, brightness, size in zip((stars.x[::step] * s).astype(int).tolist(), (stars.y[::step] * s).astype(int).tolist(),
+                                      stars.brightness[::step].tolist(), stars.size[::step].tolist()):
+        color = (brightness, brightness, brightness)
+        # For smallest stars, just set a pixel, otherwise a small circle
+        if size == 1:
+            screen.set_at((x, y), color)
         else:
-            # For size 2, draw a small circle
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), 1)
+            pygame.draw.circle(screen, color, (x, y), s)
 
 def get_level_info(score):
     """Get level info based on score"""
@@ -1209,97 +2155,1044 @@ def get_level_info(score):
 
     return gap_size, bg_color
 
-def spawn_pipe(pipes, score):
+def spawn_pipe(pipes, score, rng=random):
     """Spawn a new pipe with gap size based on score"""
     gap_size, _ = get_level_info(score)
-    pipe = Pipe()
-    pipe.gap_size = gap_size // 2  # Half the gap size since we add it both up and down
-    pipe.gap_y = random.randint(pipe.gap_size + 50, SCREEN_HEIGHT - pipe.gap_size - 50)
-    pipes.append(pipe)
-
-def check_collision(bird, pipe):
-    """Check collision between bird and pipe with more forgiving hitbox"""
-    bird_rect = bird.get_rect()
-    # Top pipe
-    if bird_rect.colliderect(pygame.Rect(pipe.x, 0,
-                                       pipe.width, pipe.gap_y - pipe.gap_size)):
-        return True
-    # Bottom pipe
-    if bird_rect.colliderect(pygame.Rect(pipe.x, pipe.gap_y + pipe.gap_size,
-                                       pipe.width, SCREEN_HEIGHT)):
-        return True
-    return False
-
-def reset_game():
+    gap_size //= 2  # Half the gap size since we add it both up and down
+    pipes.spawn(x=SCREEN_WIDTH, gap_size=gap_size,
+                gap_y=rng.randint(gap_size + 50, SCREEN_HEIGHT - gap_size - 50))
+
+def pipe_hits(bird, pipes):
+    """How many pipes the bird's (forgiving) hitbox touches"""
+    hits = rects_overlap(bird.get_rect(), pipe_rects(pipes)).reshape(2, -1).any(axis=0)
+    return int(np.count_nonzero(hits & pipes.alive))
+
+def swept_rect_hits(previous, current, sizes, rects):
+    """Time of first contact between moving boxes and static rects.
+
+    previous and current are (N, 2) top-left corners of each moving box before
+    and after its last move, sizes (N, 2) its width and height, and rects (M, 4)
+    static x, y, width, height. Returns an (N, M) array of entry times in [0, 1]
+    along each move, np.inf where the box never touches the rect, so a fast
+    box cannot pass through a thin rect between two positions.
+    """
+    if len(previous) == 0 or len(rects) == 0:
+        return np.full((len(previous), len(rects)), np.inf)
+
+    # Minkowski sum: shrink each moving box to its corner and grow the rects
+    start = previous[:, None, :]
+    delta = (current - previous)[:, None, :]
+    low = rects[None, :, :2] - sizes[:, None, :]
+    high = rects[None, :, :2] + rects[None, :, 2:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_low = (low - start) / delta
+        t_high = (high - start) / delta
+    # Axes without motion are either always inside the slab or never
+    still = delta == 0
+    inside = (start > low) & (start < high)
+    t_near = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t_low, t_high))
+    t_far = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t_low, t_high))
+
+    entry = np.maximum(t_near.max(axis=2), 0.0)
+    leave = np.minimum(t_far.min(axis=2), 1.0)
+    return np.where(entry < leave, entry, np.inf)
+
+def swept_circle_hits(previous, current, radii, centers, target_radii):
+    """Time of first contact between moving circles and static circles.
+
+    previous and current are (N, 2) centres before and after the last move,
+    radii (N,) the moving radii, centers (M, 2) and target_radii (M,) the static
+    circles. Returns an (N, M) array of entry times in [0, 1], np.inf on a miss.
+    """
+    if len(previous) == 0 or len(centers) == 0:
+        return np.full((len(previous), len(centers)), np.inf)
+
+    delta = current - previous
+    offset = previous[:, None, :] - centers[None, :, :]
+    reach = radii[:, None] + target_radii[None, :]
+    a = (delta * delta).sum(axis=1)[:, None]
+    half_b = (offset * delta[:, None, :]).sum(axis=2)
+    c = (offset * offset).sum(axis=2) - reach * reach
+    disc = half_b * half_b - a * c
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (-half_b - np.sqrt(np.maximum(disc, 0.0))) / a
+    overlapping = c < 0  # Already touching at the start of the move
+    hit = overlapping | ((a > 0) & (disc >= 0) & (t >= 0) & (t <= 1))
+    return np.where(hit, np.where(overlapping, 0.0, t), np.inf)
+
+def hits_in_order(times):
+    """Indices of the finite entry times in a row, earliest first"""
+    order = np.argsort(times, kind='stable')
+    return order[:np.count_nonzero(np.isfinite(times))]
+
+def bullet_sweeps(bullets):
+    """Previous and current top-left corners and sizes of bullet collision boxes"""
+    rects = np.array([bullet.get_rect() for bullet in bullets], dtype=float).reshape(-1, 4)
+    moves = np.array([(bullet.x - bullet.prev_x, bullet.y - bullet.prev_y) for bullet in bullets],
+                     dtype=float).reshape(-1, 2)
+    return rects[:, :2] - moves, rects[:, :2], rects[:, 2:]
+
+def bullet_paths(bullets):
+    """Previous and current centres of bullets"""
+    path = np.array([(bullet.prev_x, bullet.prev_y, bullet.x, bullet.y) for bullet in bullets],
+                    dtype=float).reshape(-1, 4)
+    return path[:, :2], path[:, 2:]
+
+# Unit ray directions for the sensor fan, computed once
+_sensor_angles = np.radians(np.linspace(-SENSOR_FAN_ANGLE / 2, SENSOR_FAN_ANGLE / 2, SENSOR_NUM_RAYS))
+SENSOR_RAY_DIRS = np.stack([np.cos(_sensor_angles), np.sin(_sensor_angles)], axis=1)
+# Avoid division by zero in the slab test for axis-aligned rays
+_sensor_inv_dirs = 1.0 / np.where(SENSOR_RAY_DIRS == 0, 1e-12, SENSOR_RAY_DIRS)
+# For each ray, which box edge (x0, y0, x1, y1 columns) is entered first and which
+# is left last depends only on the ray's direction, so the slab test needs no
+# per-entity min/max. Columns are gathered as (near x, far x, near y, far y).
+_rays_right = SENSOR_RAY_DIRS[:, 0] >= 0
+_rays_down = SENSOR_RAY_DIRS[:, 1] >= 0
+SENSOR_SLAB_COLUMNS = np.concatenate([
+    np.where(_rays_right, 0, 2),
+    np.where(_rays_right, 2, 0),
+    np.where(_rays_down, 1, 3),
+    np.where(_rays_down, 3, 1),
+])
+SENSOR_SLAB_SCALE = np.concatenate([_sensor_inv_dirs[:, 0], _sensor_inv_dirs[:, 0],
+                                    _sensor_inv_dirs[:, 1], _sensor_inv_dirs[:, 1]])
+# Smallest distance past SENSOR_MAX_DISTANCE, standing in for every miss
+SENSOR_OUT_OF_RANGE = np.nextafter(float(SENSOR_MAX_DISTANCE), np.inf)
+
+# Enemies and hostile shots beyond this many are written as columns @ weights
+# + offsets, one small product for the lot; fewer go through the tuple list,
+# which is cheaper than NumPy's per-call overhead on a handful of rows.
+# The weights are 0 or 1, so every edge comes out exactly as x - size would.
+SENSOR_LIST_LIMIT = 16
+SENSOR_CENTRED_WEIGHTS = np.array([[1, 0, 1, 0, 0], [0, 1, 0, 1, 0]], dtype=float)
+SENSOR_ENEMY_OFFSETS = np.array([-ENEMY_SIZE, -ENEMY_SIZE, ENEMY_SIZE, ENEMY_SIZE, HIT_ENEMY], dtype=float)
+SENSOR_SHOT_OFFSETS = np.array([-HOSTILE_SHOT_RADIUS, -HOSTILE_SHOT_RADIUS, HOSTILE_SHOT_RADIUS,
+                                HOSTILE_SHOT_RADIUS, HIT_UFO_BULLET], dtype=float)
+
+class SensorBoxes:
+    """Reusable (N, 5) buffer of sensor boxes, one per Game so observations allocate nothing per entity"""
+    def __init__(self, capacity=256):
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        self.rows = np.empty((capacity, 5))
+        self.rows[0] = (np.inf, np.inf, np.inf, np.inf, HIT_NONE)  # Sentinel so there is always a row
+
+    def gather(self, pipes, gates, enemies, ufos, blobs, shots):
+        """Write every entity's box as (x0, y0, x1, y1, type) and return a view of the filled rows"""
+        objects = [(g.x, g.y, g.x + g.width, g.y + g.height, HIT_GATE) for g in gates if not g.destroyed]
+        for ufo in ufos:
+            objects.append((ufo.x - ufo.radius, ufo.y - ufo.radius, ufo.x + ufo.radius, ufo.y + ufo.radius,
+                            HIT_UFO))
+        tentacles = []
+        for blob in blobs:
+            objects.append((blob.x - blob.radius, blob.y - blob.radius, blob.x + blob.radius,
+                            blob.y + blob.radius, HIT_BLOB))
+            tentacles.append(blob.tentacle_points[:, 2::2])
+        # Only a few pipes are ever on screen
+        if len(pipes):
+            for x, gap_y, gap_size, alive in zip(*(column.tolist() for column in
+                                                   pipes.view('x', 'gap_y', 'gap_size', 'alive'))):
+                if alive:
+                    objects.append((x, 0, x + PIPE_WIDTH, gap_y - gap_size, HIT_PIPE))
+                    objects.append((x, gap_y + gap_size, x + PIPE_WIDTH, SCREEN_HEIGHT, HIT_PIPE))
+        crowds = []
+        for archetype, size, kind, offsets in ((enemies, ENEMY_SIZE, HIT_ENEMY, SENSOR_ENEMY_OFFSETS),
+                                               (shots, HOSTILE_SHOT_RADIUS, HIT_UFO_BULLET, SENSOR_SHOT_OFFSETS)):
+            if len(archetype) > SENSOR_LIST_LIMIT:
+                crowds.append((archetype.view('x', 'y', 'alive'), offsets))
+            elif len(archetype):
+                for x, y, alive in zip(*(column.tolist() for column in archetype.view('x', 'y', 'alive'))):
+                    if alive:
+                        objects.append((x - size, y - size, x + size, y + size, kind))
+
+        n = 1 + len(objects)
+        for (x, y, alive), offsets in crowds:
+            n += len(x)
+        for joints in tentacles:
+            n += joints.shape[0] * joints.shape[1]
+        if n > len(self.rows):
+            self.grow(max(n, 2 * len(self.rows)))
+        rows = self.rows
+        i = 1 + len(objects)
+        if objects:
+            rows[1:i] = objects
+
+        # Crowds straight from their columns, killed rows pushed out of every ray's reach
+        for (x, y, alive), offsets in crowds:
+            part = rows[i:i + len(x)]
+            np.matmul(np.array((x, y)).T, SENSOR_CENTRED_WEIGHTS, out=part)
+            part += offsets
+            if np.count_nonzero(alive) < len(alive):
+                part[~alive] = np.inf
+            i += len(x)
+
+        # Tentacles as boxes centred on every other joint, each box spanning a
+        # full segment either side so consecutive boxes overlap
+        for blob, joints in zip(blobs, tentacles):
+            half = (blob.base_tentacle_length * blob.length_modifiers / blob.tentacle_segments)[:, None, None]
+            count = joints.shape[0] * joints.shape[1]
+            part = rows[i:i + count].reshape(joints.shape[:2] + (5,))
+            np.subtract(joints, half, out=part[..., 0:2])
+            np.add(joints, half, out=part[..., 2:4])
+            part[..., 4] = HIT_TENTACLE
+            i += count
+        return rows[:i]
+
+def get_observation(bird, pipes, gates, enemies, ufos, blobs, shots, boxes=None):
+    """Cast a fan of rays from the bird and return a compact observation vector.
+
+    The vector holds, per ray, the distance to the first hit (normalised so 1.0
+    means nothing within SENSOR_MAX_DISTANCE) followed by the HIT_* type of that
+    hit, then bird velocity, shields, weapon type value and ammo (-1 for infinite).
+    Every entity is reduced to an axis-aligned box (round ones use their bounding
+    box) so all rays are tested against all entities in a single slab pass.
+    Pass a Game's SensorBoxes as boxes to reuse its buffer between calls.
+    """
+    if boxes is None:
+        boxes = SensorBoxes()
+    entities = boxes.gather(pipes, gates, enemies, ufos, blobs, shots)
+
+    # Slab test of every ray against every box: (entities, 4 * rays)
+    relative = entities[:, :4] - (bird.x, bird.y, bird.x, bird.y)
+    t = relative[:, SENSOR_SLAB_COLUMNS]
+    t *= SENSOR_SLAB_SCALE
+    t = t.reshape(-1, 4, SENSOR_NUM_RAYS)
+    distances = np.maximum(t[:, 0], t[:, 2])
+    np.maximum(distances, 0.0, out=distances)
+    distances[np.minimum(t[:, 1], t[:, 3]) < distances] = SENSOR_OUT_OF_RANGE
+    # Misses and hits beyond range all tie at SENSOR_OUT_OF_RANGE, where
+    # argmin settles on the first row, the HIT_NONE sentinel
+    np.minimum(distances, SENSOR_OUT_OF_RANGE, out=distances)
+
+    # Nearest hit per ray across every entity
+    nearest = distances.argmin(axis=0)
+
+    ammo = bird.weapon.ammo
+    observation = np.empty(SENSOR_NUM_RAYS * 2 + 4, dtype=np.float32)
+    # Out of range reads as 1.0 once rounded to float32
+    np.divide(distances.min(axis=0), SENSOR_MAX_DISTANCE, out=observation[:SENSOR_NUM_RAYS])
+    observation[SENSOR_NUM_RAYS:SENSOR_NUM_RAYS * 2] = entities[nearest, 4]
+    observation[-4:] = (bird.velocity, bird.shields, bird.weapon.type.value,
+                        -1 if ammo == float('inf') else ammo)
+    return observation
+
+def reset_game(current_time=None, rng=random, rules=SPAWN_RULES):
+    if current_time is None:
+        current_time = pygame.time.get_ticks()
     bird = Bird()
-    pipes = []
-    enemies = []
+    pipes = make_pipes()
+    enemies = make_enemies()
     bullets = []
     powerups = []
     gates = []
     ufos = []
-    stars = [Star() for _ in range(50)]  # Reduced from 100 to 50 stars
+    hostile_shots = make_hostile_shots()
+    stars = make_stars(rng=rng)
     score = 0
-    last_pipe = pygame.time.get_ticks()
-    last_enemy = pygame.time.get_ticks()
-    last_powerup = pygame.time.get_ticks()
-    last_gate = pygame.time.get_ticks()
-    last_ufo = pygame.time.get_ticks()
     blobs = []  # Add to reset_game() too
-    last_blob = pygame.time.get_ticks()
-    blob_frequency = 20000  # Increased from 5000 to 20000 (20 seconds base frequency)
-    return bird, pipes, enemies, bullets, powerups, gates, ufos, stars, score, last_pipe, last_enemy, last_powerup, last_gate, last_ufo, blobs, last_blob, blob_frequency
+    spawner = SpawnScheduler(rules, current_time, rng)
+    return bird, pipes, enemies, bullets, powerups, gates, ufos, hostile_shots, stars, score, blobs, spawner
 
-def draw_message(screen, text, y_offset=0):
-    """Draw centered text message"""
-    font = pygame.font.Font(None, 36)
+def render_message(text, y_offset=0):
+    """Centered text message as a (surface, rect) pair ready to blit"""
+    font = ui_font(36)
     text_surface = font.render(text, True, WHITE)
     text_rect = text_surface.get_rect()
-    text_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + y_offset)
-    screen.blit(text_surface, text_rect)
-
-def load_sounds():
-    """Load all game sounds"""
-    sounds = {}
-    sound_files = [
-        'shoot', 'laser', 'spread', 'hit', 'game_over', 'power_up',
-        'enemy_death', 'charge', 'shield_recharge', 'ufo_hit',
-        'ufo_death', 'ufo_shoot', 'title_music', 'ufo_presence',
-        'explosion', 'blob'  # Add blob to sound files
+    text_rect.center = view.point(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + y_offset)
+    return text_surface, text_rect
+
+def draw_profiler(screen, clock):
+    """Draw frame timing and the current quality tier in the bottom left"""
+    font = ui_font(20)
+    lines = [
+        f"FPS: {clock.get_fps():.0f}",
+        f"Frame: {governor.average_ms():.1f} / {governor.budget_ms:.1f} ms",
+        f"Quality: {QUALITY_TIER_NAMES[governor.tier]}",
     ]
-    for file in sound_files:
+    for i, line in enumerate(lines):
+        text_surface = font.render(line, True, WHITE)
+        screen.blit(text_surface, view.point(10, SCREEN_HEIGHT - 20 * (len(lines) - i)))
+
+# Title music comes first so the menu has it as soon as possible
+SOUND_NAMES = [
+    'title_music', 'shoot', 'laser', 'spread', 'hit', 'game_over', 'power_up',
+    'enemy_death', 'charge', 'shield_recharge', 'ufo_hit',
+    'ufo_death', 'ufo_shoot', 'ufo_presence',
+    'explosion', 'blob'
+]
+
+def sound_sources(mixer_format):
+    """Yield (name, source) for every game sound, where source is PCM in the
+    mixer format or a WAV path. Does no pygame calls, so it can run off the
+    main thread.
+    """
+    try:
+        import create_sounds
+    except ImportError:
+        create_sounds = None
+    # Render straight into the format the mixer actually opened with, so the
+    # buffer hand-off needs no conversion or extra copies
+    sample_rate, size, channels = mixer_format
+    bank = {}
+    if create_sounds is not None:
+        try:
+            bank_format, bank_digest, blobs = create_sounds.open_bank()
+            if bank_digest != create_sounds.current_bank_hash():
+                # Packed before the patches last changed; synthesise the edits instead
+                print("Sound bank is out of date, synthesising sounds (run create_sounds.py to rebuild it)")
+            elif bank_format == mixer_format:
+                bank = blobs  # Only usable when it was packed for this mixer format
+        except FileNotFoundError:
+            pass  # No bank built yet; synthesise instead
+        except (OSError, ValueError) as e:
+            print(f"Sound bank unavailable - {str(e)}")
+    for name in SOUND_NAMES:
+        yield name, sound_source(name, bank, create_sounds, mixer_format)
+
+        # Pitch variants of rapidly repeated sounds, for cues to rotate through
+        if create_sounds is None or name not in create_sounds.SOUND_VARIANTS:
+            continue
+        names = [create_sounds.variant_name(name, i) for i in range(create_sounds.SOUND_VARIANTS[name])]
+        if all(variant in bank for variant in names):
+            variants = [bank[variant] for variant in names]
+        else:
+            try:
+                variants = [create_sounds.encode_pcm(samples, size, channels)
+                            for samples in create_sounds.render_variants(name, sample_rate)]
+            except Exception as e:
+                print(f"Error synthesising variants: {name} - {str(e)}")
+                continue
+        yield from zip(names, variants)
+
+def sound_source(name, bank, create_sounds, mixer_format):
+    """PCM for one sound from the bank or synthesis, else its WAV path"""
+    if name in bank:
+        return bank[name]
+    if create_sounds is not None:
+        sample_rate, size, channels = mixer_format
+        try:
+            return create_sounds.encode_pcm(create_sounds.render(name, sample_rate), size, channels)
+        except Exception as e:
+            print(f"Error synthesising sound: {name} - {str(e)}")
+    return os.path.join(GAME_DIR, 'sounds', f'{name}.wav')
+
+def make_sound(name, source):
+    """Build a Sound from a sound_sources() entry, or None if it fails"""
+    try:
+        if isinstance(source, str):
+            sound = pygame.mixer.Sound(source)
+        else:
+            sound = pygame.mixer.Sound(buffer=source)
+    except Exception as e:
+        print(f"Error loading sound: {name} - {str(e)}")
+        return None
+    sound.set_volume(0.5)
+    return sound
+
+class SoundLoader:
+    """Prepares sounds on a worker thread while the game runs.
+
+    The worker only renders or maps PCM; poll() builds the Sound objects on
+    the main thread, so pygame is never touched concurrently.
+    """
+    def __init__(self):
+        self.sounds = {}
+        self.ready = queue.Queue()
+        self.done = False
+        self.thread = threading.Thread(target=self.run, args=(pygame.mixer.get_init(),), daemon=True)
+        self.thread.start()
+
+    def run(self, mixer_format):
+        try:
+            for name, source in sound_sources(mixer_format):
+                self.ready.put((name, source))
+        except Exception as e:
+            print(f"Error loading sounds: {str(e)}")
+        self.ready.put(None)
+
+    def poll(self):
+        """Adopt every sound finished since the last call; returns their names"""
+        loaded = []
+        while not self.done:
+            try:
+                item = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.done = True
+                break
+            name, source = item
+            sound = make_sound(name, source)
+            if sound is not None:
+                self.sounds[name] = sound
+                loaded.append(name)
+        return loaded
+
+class MusicStream:
+    """Endless procedural music streamed block by block onto one channel.
+
+    A worker thread synthesises and encodes blocks from
+    create_sounds.music_blocks() into a small bounded queue; pump() turns them
+    into Sounds and keeps the channel fed, so memory stays constant whatever
+    the length.
+    """
+    def __init__(self, channel, volume=0.5):
+        self.channel = channel
+        self.volume = volume
+        self.blocks = None
+        self.stopping = None
+        self.thread = None
+
+    def play(self, theme='title', seed=None):
+        """Start streaming a theme; returns False if music synthesis is unavailable"""
+        try:
+            import create_sounds
+        except ImportError:
+            return False
+        self.stop()
+        self.blocks = queue.Queue(maxsize=MUSIC_QUEUE_BLOCKS)
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run,
+            args=(create_sounds, theme, seed, pygame.mixer.get_init(), self.blocks, self.stopping),
+            daemon=True)
+        self.thread.start()
+        return True
+
+    def run(self, create_sounds, theme, seed, mixer_format, blocks, stopping):
+        sample_rate, size, channels = mixer_format
         try:
-            sound = pygame.mixer.Sound(f"sounds/{file}.wav")
-            sound.set_volume(0.5)
-            sounds[file] = sound
+            for samples in create_sounds.music_blocks(theme, MUSIC_BLOCK_FRAMES, sample_rate, seed):
+                data = create_sounds.encode_pcm(samples, size, channels).tobytes()
+                while not stopping.is_set():
+                    try:
+                        blocks.put(data, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stopping.is_set():
+                    return
         except Exception as e:
-            print(f"Error loading sound: {file} - {str(e)}")
-    return sounds
-
-def spawn_powerup(last_powerup, current_time):
-    if current_time - last_powerup >= 8000:  # Spawn every 8 seconds
-        x = SCREEN_WIDTH
-        y = random.randint(50, SCREEN_HEIGHT - 50)
-        powerup_type = random.choice([
-            PowerUpType.SHIELD,
-            PowerUpType.SPREAD,
-            PowerUpType.LASER,
-            PowerUpType.CHARGE,
-            PowerUpType.NUKE,
+            print(f"Error streaming music: {str(e)}")
+
+    def stop(self):
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread = None
+            self.blocks = None
+            self.channel.stop()
+
+    def pump(self):
+        """Keep one block playing and one queued"""
+        if self.blocks is None:
+            return
+        if not self.channel.get_busy():
+            self.feed(self.channel.play)
+        if self.channel.get_queue() is None:
+            self.feed(self.channel.queue)
+
+    def feed(self, start):
+        try:
+            data = self.blocks.get_nowait()
+        except queue.Empty:
+            return  # Worker has not caught up yet
+        block = pygame.mixer.Sound(buffer=data)
+        block.set_volume(self.volume)
+        start(block)
+
+def spawn_powerup(rng=random):
+    y = rng.randint(50, SCREEN_HEIGHT - 50)
+    powerup_type = rng.choice([
+        PowerUpType.SHIELD,
+        PowerUpType.SPREAD,
+        PowerUpType.LASER,
+        PowerUpType.CHARGE,
+        PowerUpType.NUKE,
+    ])
+    return PowerUp(powerup_type, SCREEN_WIDTH, y)
+
+def spawn_ufo(current_time, rng=random, phase=0.0):
+    ufo = UFO(SCREEN_WIDTH + 40, rng.randint(50, SCREEN_HEIGHT//3), current_time)
+    ufo.movement_timer = phase  # Offsets the pattern so several UFOs spread out
+    return ufo
+
+def load_difficulty(name):
+    """Spawn rules and waves for a difficulty from waves/<name>.json"""
+    with open(os.path.join(GAME_DIR, 'waves', f'{name}.json')) as f:
+        data = json.load(f)
+    rules = {**SPAWN_RULES, **data.get('rules', {})}
+    return {rule: value for rule, value in rules.items() if value is not None}, data.get('waves', [])
+
+def rule_interval(rule, score):
+    """A spawn rule's interval at the level for score"""
+    interval = rule['interval']
+    if isinstance(interval, (tuple, list)):
+        return interval[min(score // 100, len(interval) - 1)]
+    return interval
+
+class SpawnScheduler:
+    """Runs spawn rules from a heap of due times.
+
+    Each rule has one entry in the heap, so a tick only does work for the
+    rules that are actually due. Every roll is taken from rng, which makes a
+    run reproducible from its seed.
+    """
+    def __init__(self, rules, current_time, rng):
+        self.rules = rules
+        self.rng = rng
+        # (due time, declaration order, name); the order breaks ties
+        self.heap = [(current_time + rule_interval(rule, 0), order, name)
+                     for order, (name, rule) in enumerate(rules.items())]
+        heapq.heapify(self.heap)
+
+    def run(self, current_time, score, spawn):
+        """Fire every due rule through spawn(name, rule, rng, current_time),
+        which returns False if it declined (e.g. the rule's limit is reached)
+        """
+        while self.heap and self.heap[0][0] <= current_time:
+            _, order, name = heapq.heappop(self.heap)
+            rule = self.rules[name]
+            spawned = (score >= rule.get('min_score', 0)
+                       and ('chance' not in rule or self.rng.random() < rule['chance'])
+                       and spawn(name, rule, self.rng, current_time))
+            if spawned or 'retry' not in rule:
+                delay = rule_interval(rule, score)
+            else:
+                delay = rule['retry']
+            heapq.heappush(self.heap, (current_time + delay, order, name))
+
+class Game:
+    """State and per-tick logic for one session, driven by main() or by step()"""
+    def __init__(self, headless=False, seed=None, difficulty='normal'):
+        self.headless = headless
+        self.screen = None
+        if headless:
+            # Draw into an offscreen surface; no window or mixer needed
+            if not pygame.get_init():
+                pygame.init()
+            self.screen = pygame.Surface(view.size)
+        self.high_score = 0
+        self.rng = random.Random(seed)  # Spawn rolls, see SpawnScheduler
+        self.sensor_boxes = SensorBoxes()  # Reused by every get_observation
+        self.particles = ParticleSystem()
+        # Bottom to top; the background and HUD are only redrawn on change
+        self.layers = Compositor([
+            Layer('background', self.draw_background, key=lambda: get_level_info(self.score)[1]),
+            Layer('parallax', self.draw_parallax),
+            Layer('world', self.draw_world),
+            Layer('effects', self.draw_effects),
+            Layer('hud', self.draw_hud, key=self.hud_key),
         ])
-        return PowerUp(powerup_type, x, y), current_time
-    return None, last_powerup
+        self.set_difficulty(difficulty)
+        self.current_time = 0  # Simulated clock used by step()
+        self.reset(MENU, pygame.time.get_ticks())
+
+    def set_difficulty(self, difficulty):
+        """Switch spawn rules and waves; applies from the next reset"""
+        self.difficulty = difficulty
+        self.rules, self.waves = load_difficulty(difficulty)
+
+    def reset(self, state=PLAYING, current_time=None, seed=None):
+        """Start a fresh run in the given state; a seed makes its spawns repeatable"""
+        if current_time is None:
+            current_time = self.current_time
+        if seed is not None:
+            self.rng.seed(seed)
+        (self.bird, self.pipes, self.enemies, self.bullets, self.powerups, self.gates,
+         self.ufos, self.hostile_shots, self.stars, self.score, self.blobs, self.spawner) = reset_game(current_time, self.rng, self.rules)
+        self.wave_index = 0
+        self.particles.clear()
+        self.state = state
+        self.charging_started = False
+        self.shoot_held = False
+
+    def get_observation(self):
+        return get_observation(self.bird, self.pipes, self.gates, self.enemies, self.ufos, self.blobs,
+                               self.hostile_shots, self.sensor_boxes)
+
+    def player_hit(self, current_time):
+        """Apply a hit to the bird and end the game if it died"""
+        if self.bird.take_hit(current_time, self.particles):
+            game_over_sound.play()
+            ufo_presence_sound.stop()  # Stop UFO sound when player dies
+            self.high_score = max(self.score, self.high_score)
+            self.state = GAME_OVER
+
+    def detonate_nuke(self, current_time):
+        should_reset, enemies_killed = self.bird.detonate_nuke(
+            self.enemies, self.bullets, self.ufos, self.gates, self.blobs, self.particles, current_time)
+        self.score += enemies_killed * 5  # Add 5 points per enemy killed
+        return should_reset
+
+    def press_shoot(self, current_time):
+        """Shoot key pressed"""
+        bird = self.bird
+        if bird.weapon.type == WeaponType.CHARGE:
+            bird.start_charging(current_time)
+            self.charging_started = True
+        elif bird.weapon.type == WeaponType.NUKE and bird.active_nuke:
+            # Only handle detonation on key press
+            should_reset = self.detonate_nuke(current_time)
+            if should_reset and bird.weapon.ammo <= 0:  # Only reset if out of ammo and after detonation
+                bird.weapon = Weapon()
+        else:
+            # Handle all other weapons including nuke launch
+            new_bullets, should_reset = bird.shoot(current_time)
+            self.bullets.extend(new_bullets)
+            if should_reset:
+                bird.weapon = Weapon()
+
+    def hold_shoot(self, current_time):
+        """Shoot key held down"""
+        bird = self.bird
+        if bird.weapon.type == WeaponType.CHARGE and not self.charging_started:
+            bird.start_charging(current_time)
+            self.charging_started = True
+        elif not self.charging_started and bird.weapon.type != WeaponType.NUKE:
+            new_bullets, should_reset = bird.shoot(current_time)
+            self.bullets.extend(new_bullets)
+            if should_reset:
+                bird.weapon = Weapon()
+
+    def release_shoot(self, current_time):
+        """Shoot key released"""
+        if self.charging_started:
+            new_bullets, should_reset = self.bird.release_charge(current_time)
+            self.bullets.extend(new_bullets)
+            if should_reset:
+                self.bird.weapon = Weapon()
+            self.charging_started = False
+
+    def spawn(self, name, rule, rng, current_time):
+        """Spawn one entity for a due SPAWN_RULES entry"""
+        if name == 'pipe':
+            spawn_pipe(self.pipes, self.score, rng)
+        elif name == 'enemy':
+            spawn_enemy(self.enemies, rng)
+        elif name == 'powerup':
+            self.powerups.append(spawn_powerup(rng))
+        elif name == 'gate':
+            self.gates.append(Gate(rng.randint(100, SCREEN_HEIGHT - 100)))
+        elif name == 'ufo':
+            if len(self.ufos) >= rule.get('limit', float('inf')):
+                return False
+            if not self.ufos:
+                ufo_presence_sound.play(-1)  # Loop the sound
+            self.ufos.append(spawn_ufo(current_time, rng, rng.uniform(0, 2 * math.pi) if self.ufos else 0.0))
+        elif name == 'blob':
+            if len(self.blobs) >= rule.get('limit', float('inf')):
+                return False
+            self.blobs.append(TentacleBlob(y=rng.randint(50, SCREEN_HEIGHT - 50), current_time=current_time,
+                                           rng=rng))
+        elif name == 'wave':
+            # Next wave in the cycle the score has unlocked
+            waves = [wave for wave in self.waves if self.score >= wave.get('min_score', 0)]
+            if not waves:
+                return False
+            wave = waves[self.wave_index % len(waves)]
+            self.wave_index += 1
+            spawn_wave(self.enemies, wave, rng)
+            # Escorts, within the usual UFO and blob limits
+            for kind, key in (('ufo', 'ufos'), ('blob', 'blobs')):
+                for _ in range(wave.get(key, 0)):
+                    if kind in self.rules:
+                        self.spawn(kind, self.rules[kind], rng, current_time)
+        return True
 
-def spawn_ufo(last_ufo, current_time):
-    # 30% chance to spawn UFO every 10 seconds
-    if current_time - last_ufo >= 10000 and random.random() < 0.3:
-        ufo = UFO()  # Use default initialization
-        return ufo, current_time
-    return None, last_ufo
+    def update(self, current_time):
+        """Advance gameplay by one tick"""
+        bird = self.bird
+        pipes = self.pipes
+        enemies = self.enemies
+        bullets = self.bullets
+        powerups = self.powerups
+        gates = self.gates
+        ufos = self.ufos
+        blobs = self.blobs
+        particles = self.particles
+
+        # Update charge weapon
+        if self.charging_started:
+            bird.update_charge(current_time)
+
+        # Spawn whatever is due
+        self.spawner.run(current_time, self.score, self.spawn)
+
+        # Update
+        bird.update(current_time)
+
+        # Expanding nuke shock wave damages whatever it has reached so far
+        if bird.explosion and bird.explosion.expanding:
+            explosion = bird.explosion
+            self.score += apply_blast(explosion, min(explosion.current_radius, explosion.radius),
+                                      enemies, ufos, gates, blobs, particles, current_time) * 5
+
+        # Update pipes and check for score
+        self.score += update_pipes(pipes, bird.x)
+
+        # Update enemies
+        update_enemies(enemies)
+
+        # Update powerups
+        for powerup in powerups[:]:
+            powerup.update()
+            if powerup.x + powerup.size < 0:
+                powerups.remove(powerup)
+
+        # Collect the powerups the bird touches
+        touched = sprite_hits('bird', bird.x, bird.y, 'powerup',
+                              [powerup.x for powerup in powerups], [powerup.y for powerup in powerups])
+        for powerup in [powerups[i] for i in touched]:
+            powerup.collect(bird)
+            powerups.remove(powerup)
+
+        # Update gates
+        for gate in gates[:]:
+            gate.update()
+            if gate.x + gate.width < 0:
+                gates.remove(gate)
+            elif not gate.destroyed:
+                # Check collision with bird
+                if bird.get_rect().colliderect(gate.get_rect()):
+                    self.player_hit(current_time)
+
+        # Hostile shots move once, then are checked against the player along
+        # their last move in one query
+        update_hostile_shots(self.hostile_shots)
+        hits = hostile_shot_hits(self.hostile_shots, bird.get_rect())
+        for _ in hits:
+            self.player_hit(current_time)
+        self.hostile_shots.kill(hits)
+
+        # Update UFOs; new shots join the pool and move from the next tick
+        for ufo in ufos[:]:
+            ufo.update(current_time, self.hostile_shots)
+            if ufo.x + ufo.radius < 0:
+                ufos.remove(ufo)
+                if len(ufos) == 0:
+                    ufo_presence_sound.stop()
+
+            # Check collision with bird bullets along their last move
+            shots = bullets[:]
+            start, end = bullet_paths(shots)
+            ufo_times = swept_circle_hits(start, end, np.zeros(len(shots)),
+                                          np.array([(ufo.x, ufo.y)]), np.array([ufo.radius + 5.0]))
+            for i in hits_in_order(ufo_times[:, 0]):
+                bullet = shots[i]
+                if bullet in bullets:
+                    bullets.remove(bullet)
+                    ufo.health -= 1
+                    ufo_hit_sound.play(x=ufo.x)
+                    particles.burst(bullet.x, bullet.y, 12, (192, 192, 192), speed=2)
+                    if ufo.health <= 0:
+                        ufos.remove(ufo)
+                        self.score += 10
+                        ufo_death_sound.play(x=ufo.x)
+                        particles.burst(ufo.x, ufo.y, 80, (255, 255, 200), speed=4)
+                        if len(ufos) == 0:
+                            ufo_presence_sound.stop()
+                        # Spawn powerup
+                        powerup_type = self.rng.choice([PowerUpType.SHIELD, PowerUpType.SPREAD,
+                                                        PowerUpType.LASER, PowerUpType.CHARGE])
+                        powerups.append(PowerUp(powerup_type, ufo.x, ufo.y))
+                        break
 
-def main():
+        # Sweep every bullet's last move against gates and enemies in one pass.
+        # Targets are widened by the distance they moved this tick.
+        shots = bullets[:]
+        previous, current, sizes = bullet_sweeps(shots)
+        gate_list = gates[:]
+        target_rects = np.array([(g.x, g.y, g.width + g.speed, g.height) for g in gate_list],
+                                dtype=float).reshape(-1, 4)
+        rects = enemy_rects(enemies)
+        rects[:, 2] += enemies.speed
+        times = swept_rect_hits(previous, current, sizes, np.concatenate([target_rects, rects]))
+        gate_times = times[:, :len(gate_list)]
+        enemy_times = times[:, len(gate_list):]
+
+        # Check gate collisions, visiting only bullets that touched something
+        for i in np.flatnonzero(np.isfinite(times).any(axis=1)):
+            bullet = shots[i]
+            for j in hits_in_order(gate_times[i]):
+                gate = gate_list[j]
+                if not gate.destroyed:
+                    if bullet.weapon_type == WeaponType.NUKE and bullet == bird.active_nuke:
+                        # Auto-detonate nuke on gate collision
+                        if self.detonate_nuke(current_time):
+                            bird.weapon = Weapon()
+                        break
+                    else:
+                        # Normal bullet collision
+                        if gate.hit(bullet.damage, current_time, self.particles):
+                            self.score += 5  # Bonus points for destroying a gate
+                        if bullet in bullets:
+                            bullets.remove(bullet)
+                        break
+
+            # Check enemy collisions if bullet didn't hit a gate
+            for j in hits_in_order(enemy_times[i]):
+                if enemies.alive[j]:
+                    if bullet.weapon_type == WeaponType.NUKE and bullet == bird.active_nuke:
+                        # Auto-detonate nuke on enemy collision
+                        if self.detonate_nuke(current_time):
+                            bird.weapon = Weapon()
+                        break
+                    else:
+                        # Normal bullet collision
+                        enemy_death_sound.play(x=enemies.x[j])
+                        particles.burst(enemies.x[j], enemies.y[j], 30, RED)
+                        self.score += bullet.damage * 2
+                        if bullet in bullets:
+                            bullets.remove(bullet)
+                        enemies.kill(j)
+                        break
+        enemies.compact()
+
+        # Check collisions with pipes
+        for _ in range(pipe_hits(bird, pipes)):
+            self.player_hit(current_time)
+
+        # Check collisions with enemies
+        for _ in sprite_hits('bird', bird.x, bird.y, 'enemy', enemies.x, enemies.y):
+            self.player_hit(current_time)
+
+        # Update bullets
+        for bullet in bullets[:]:  # Use slice copy to safely modify list while iterating
+            bullet.update()  # Move bullets
+            # Only remove non-nuke bullets that leave the world
+            if bullet.is_off_screen() and bullet != bird.active_nuke:
+                bullets.remove(bullet)
+
+        # Update blobs
+        for blob in blobs[:]:
+            if blob not in blobs:
+                continue  # Killed earlier this tick, e.g. by a nuke detonated on another blob
+            blob.update(current_time)
+
+            # Check collision with player
+            if bird.get_rect().colliderect(blob.get_rect()):
+                blob.flash()  # Flash when hitting player
+                self.player_hit(current_time)
+                continue
+
+            # Check tentacle collisions with player
+            for tentacle_rect in blob.get_tentacle_rects():
+                if bird.get_rect().colliderect(tentacle_rect):
+                    blob.flash()  # Flash when hitting player with tentacles
+                    self.player_hit(current_time)
+                    break
+
+            # Check bullet collisions along each bullet's last move
+            shots = bullets[:]
+            previous, current, sizes = bullet_sweeps(shots)
+            blob_rect = np.array([blob.get_rect()], dtype=float)
+            for i in hits_in_order(swept_rect_hits(previous, current, sizes, blob_rect)[:, 0]):
+                bullet = shots[i]
+                if bullet in bullets:
+                    blob.flash()  # Flash when hit by bullet
+                    if bullet.weapon_type == WeaponType.NUKE and bullet == bird.active_nuke:
+                        if self.detonate_nuke(current_time):
+                            bird.weapon = Weapon()
+                    else:
+                        blob.health -= bullet.damage
+                        ufo_hit_sound.play(x=blob.x)
+                        particles.burst(bullet.x, bullet.y, 12, blob.color, speed=2)
+                        if blob.health <= 0:
+                            blobs.remove(blob)
+                            self.score += 10
+                            ufo_death_sound.play(x=blob.x)
+                            particles.burst(blob.x, blob.y, 80, blob.color, speed=4)
+                            # Spawn powerup when blob dies
+                            powerup_type = self.rng.choice([
+                                PowerUpType.SHIELD,
+                                PowerUpType.SPREAD,
+                                PowerUpType.LASER,
+                                PowerUpType.CHARGE,
+                                PowerUpType.NUKE  # Include NUKE in blob's drops
+                            ])
+                            powerups.append(PowerUp(powerup_type, blob.x, blob.y))
+                        bullets.remove(bullet)
+                    break
+
+        # Sparks are part of the simulation: one step per tick, drawn or not
+        self.particles.update()
+
+    def update_effects(self):
+        """Scenery, which keeps moving outside of play too"""
+        update_stars(self.stars)
+
+    def draw(self, screen, current_time):
+        self.layers.render(screen, current_time)
+
+    def draw_background(self, frame, current_time):
+        # Flat level colour, redrawn only when the level changes
+        _, bg_color = get_level_info(self.score)
+        background = pygame.Surface(frame.get_size(), 0, frame)
+        background.fill(bg_color)
+        return [(background, (0, 0))]
+
+    def draw_parallax(self, screen, current_time):
+        # Stars, thinned when detail is reduced
+        star_step = 2 if governor.tier >= QUALITY_REDUCED_DETAIL else 1
+        draw_stars(screen, self.stars, star_step)
+
+    def draw_world(self, screen, current_time):
+        if self.state == MENU:
+            return
+
+        # Draw game elements
+        self.bird.draw(screen, current_time, self.score)
+        draw_pipes(screen, self.pipes)
+
+        # Sprites culled to the screen and submitted in one call, a kind at a time
+        sprites = enemy_blits(self.enemies)
+        sprites += entity_blits(self.bullets, current_time)
+        sprites += entity_blits([powerup for powerup in self.powerups if not powerup.collected], current_time)
+        sprites += entity_blits([gate for gate in self.gates if not gate.destroyed], current_time)
+        sprites += entity_blits(self.ufos, current_time)
+        sprites += hostile_shot_blits(self.hostile_shots)
+        screen.blits(sprites, doreturn=False)
+
+        # Draw blobs
+        for blob in self.blobs:
+            blob.draw(screen)
+
+    def draw_effects(self, screen, current_time):
+        if self.state == MENU:
+            return
+
+        # Sparks over every entity, under the UI
+        self.particles.draw(screen)
+
+        # One glow pass for the whole scene
+        if BLOOM and governor.tier < QUALITY_NO_GLOW:
+            bloom.apply(screen)
+
+    def hud_key(self):
+        weapon = self.bird.weapon
+        return self.state, self.difficulty, self.score, self.high_score, weapon.type, weapon.ammo
+
+    def draw_hud(self, frame, current_time):
+        # Text only changes with hud_key, so it is rendered once per change
+        if self.state == MENU:
+            return [render_message("Space Flapper", -80),
+                    render_message("Press SPACE to Start", -40),
+                    render_message("X to Shoot, SPACE to Flap", 0),
+                    render_message(f"D: {self.difficulty.capitalize()} mode", 60)]
+
+        font = ui_font(36)
+
+        # Score in top left
+        score_text = font.render(f'Score: {self.score}', True, WHITE)
+        hud = [(score_text, view.point(10, 10))]
+
+        # High score in top right
+        high_score_text = font.render(f'High Score: {self.high_score}', True, WHITE)
+        high_score_rect = high_score_text.get_rect()
+        high_score_rect.topright = view.point(SCREEN_WIDTH - 10, 10)
+        hud.append((high_score_text, high_score_rect))
+
+        # Weapon info if not using default weapon
+        if self.bird.weapon.type != WeaponType.DEFAULT:
+            font = ui_font(24)
+            ammo_text = f"Ammo: {self.bird.weapon.ammo}"
+            hud.append((font.render(ammo_text, True, WHITE), view.point(10, 40)))
+            weapon_text = f"Weapon: {self.bird.weapon.type.name}"
+            hud.append((font.render(weapon_text, True, WHITE), view.point(10, 70)))
+
+        if self.state == GAME_OVER:
+            hud.append(render_message("Game Over!", -20))
+            hud.append(render_message("Press SPACE to Play Again", 20))
+        return hud
+
+    def step(self, action, repeat=1, render=True):
+        """Advance the game by `repeat` ticks while holding `action`.
+
+        `action` is a combination of the ACTION_* flags. A flap is applied on the
+        first tick only, like a key press; shooting is held for every tick.
+        Stepping runs on a simulated clock of TICK_MS per tick and stops early
+        if the bird dies. Only the final tick is drawn, and only when `render`
+        is True. Returns (observation, reward, done) where reward is the score
+        gained over the ticks that ran.
+        """
+        if self.state != PLAYING:
+            self.reset(PLAYING)
+
+        shooting = bool(action & ACTION_SHOOT)
+        start_score = self.score
+        for tick in range(repeat):
+            self.current_time += TICK_MS
+            current_time = self.current_time
+            if tick == 0 and action & ACTION_FLAP:
+                self.bird.flap()
+            if shooting and not self.shoot_held:
+                self.press_shoot(current_time)
+            if shooting:
+                self.hold_shoot(current_time)
+            elif self.shoot_held:
+                self.release_shoot(current_time)
+            self.shoot_held = shooting
+
+            self.update(current_time)
+            if self.state == GAME_OVER:
+                break
+
+        if render and self.screen is not None:
+            self.update_effects()
+            self.draw(self.screen, self.current_time)
+
+        return self.get_observation(), self.score - start_score, self.state == GAME_OVER
+
+def sound_variants(sounds, name):
+    """Loaded pitch variants of a sound, in order"""
+    return [sounds[key] for key in sorted(sounds) if key.startswith(name + '~')]
+
+def assign_sounds(sounds, fallback):
+    """Point the module-level sound globals at dispatcher cues for loaded sounds"""
     global shoot_sound, laser_sound, spread_sound, hit_sound, shield_up_sound, power_up_sound, game_over_sound, enemy_death_sound, charge_sound, shield_recharge_sound, ufo_hit_sound, ufo_death_sound, ufo_shoot_sound, title_music, ufo_presence_sound, explosion_sound, blob_sound
 
+    # Assign sounds from the dictionary; plays are queued for the dispatcher
+    shoot_sound = sound_dispatcher.cue('shoot', sounds.get('shoot', fallback), sound_variants(sounds, 'shoot'))
+    laser_sound = sound_dispatcher.cue('laser', sounds.get('laser', fallback), sound_variants(sounds, 'laser'))
+    spread_sound = sound_dispatcher.cue('spread', sounds.get('spread', fallback), sound_variants(sounds, 'spread'))
+    hit_sound = sound_dispatcher.cue('hit', sounds.get('hit', fallback))
+    power_up_sound = sound_dispatcher.cue('power_up', sounds.get('power_up', fallback))
+    game_over_sound = sound_dispatcher.cue('game_over', sounds.get('game_over', fallback))
+    enemy_death_sound = sound_dispatcher.cue('enemy_death', sounds.get('enemy_death', fallback))
+    charge_sound = sound_dispatcher.cue('charge', sounds.get('charge', fallback))
+    shield_recharge_sound = sound_dispatcher.cue('shield_recharge', sounds.get('shield_recharge', fallback))
+    ufo_hit_sound = sound_dispatcher.cue('ufo_hit', sounds.get('ufo_hit', fallback))
+    ufo_death_sound = sound_dispatcher.cue('ufo_death', sounds.get('ufo_death', fallback))
+    ufo_shoot_sound = sound_dispatcher.cue('ufo_shoot', sounds.get('ufo_shoot', fallback), sound_variants(sounds, 'ufo_shoot'))
+    title_music = sound_dispatcher.cue('title_music', sounds.get('title_music', fallback))
+    ufo_presence_sound = sound_dispatcher.cue('ufo_presence', sounds.get('ufo_presence', fallback))
+    explosion_sound = sound_dispatcher.cue('explosion', sounds.get('explosion', fallback))
+    blob_sound = sound_dispatcher.cue('blob', sounds.get('blob', fallback))
+
+    # Set volumes
+    shoot_sound.set_volume(0.4)
+    laser_sound.set_volume(0.4)
+    spread_sound.set_volume(0.4)
+    hit_sound.set_volume(0.4)
+    power_up_sound.set_volume(0.5)
+    game_over_sound.set_volume(0.5)
+    enemy_death_sound.set_volume(0.5)
+    charge_sound.set_volume(0.4)
+    shield_recharge_sound.set_volume(0.5)
+    ufo_hit_sound.set_volume(0.4)
+    ufo_death_sound.set_volume(0.5)
+    ufo_shoot_sound.set_volume(0.3)
+    title_music.set_volume(0.5)
+    ufo_presence_sound.set_volume(0.2)
+    explosion_sound.set_volume(0.5)
+    blob_sound.set_volume(0.4)
+
+    shield_up_sound = power_up_sound
+
+def main(render_scale=RENDER_SCALE, window_size=WINDOW_SIZE, fullscreen=FULLSCREEN):
     pygame.init()
     pygame.mixer.quit()
     pygame.mixer.pre_init(44100, -16, 2, 1024)
@@ -1310,454 +3203,103 @@ def main():
     print(f"Sound enabled: {pygame.mixer.get_num_channels() > 0}")
 
     empty_sound = pygame.mixer.Sound(buffer=b'')
+    sound_dispatcher.setup()
+    # Every sound is silent until the loader delivers it
+    assign_sounds({}, empty_sound)
 
-    try:
-        # Load all sounds
-        sounds = load_sounds()
-
-        # Assign sounds from the dictionary
-        shoot_sound = sounds.get('shoot', empty_sound)
-        laser_sound = sounds.get('laser', empty_sound)
-        spread_sound = sounds.get('spread', empty_sound)
-        hit_sound = sounds.get('hit', empty_sound)
-        power_up_sound = sounds.get('power_up', empty_sound)
-        game_over_sound = sounds.get('game_over', empty_sound)
-        enemy_death_sound = sounds.get('enemy_death', empty_sound)
-        charge_sound = sounds.get('charge', empty_sound)
-        shield_recharge_sound = sounds.get('shield_recharge', empty_sound)
-        ufo_hit_sound = sounds.get('ufo_hit', empty_sound)
-        ufo_death_sound = sounds.get('ufo_death', empty_sound)
-        ufo_shoot_sound = sounds.get('ufo_shoot', empty_sound)
-        title_music = sounds.get('title_music', empty_sound)
-        ufo_presence_sound = sounds.get('ufo_presence', empty_sound)
-        explosion_sound = sounds.get('explosion', empty_sound)
-        blob_sound = sounds.get('blob', empty_sound)
-
-        # Set volumes
-        shoot_sound.set_volume(0.4)
-        laser_sound.set_volume(0.4)
-        spread_sound.set_volume(0.4)
-        hit_sound.set_volume(0.4)
-        power_up_sound.set_volume(0.5)
-        game_over_sound.set_volume(0.5)
-        enemy_death_sound.set_volume(0.5)
-        charge_sound.set_volume(0.4)
-        shield_recharge_sound.set_volume(0.5)
-        ufo_hit_sound.set_volume(0.4)
-        ufo_death_sound.set_volume(0.5)
-        ufo_shoot_sound.set_volume(0.3)
-        title_music.set_volume(0.5)
-        ufo_presence_sound.set_volume(0.2)
-        explosion_sound.set_volume(0.5)
-        blob_sound.set_volume(0.4)
-
-        shield_up_sound = power_up_sound
-
-    except Exception as e:
-        print(f"Error loading sounds: {str(e)}")
-        print("Running without sound.")
-        # Assign empty sound to all sound variables if loading fails
-        shoot_sound = laser_sound = spread_sound = hit_sound = shield_up_sound = \
-        power_up_sound = game_over_sound = enemy_death_sound = charge_sound = \
-        shield_recharge_sound = ufo_hit_sound = ufo_death_sound = ufo_shoot_sound = \
-        title_music = ufo_presence_sound = explosion_sound = blob_sound = empty_sound
-
-    game_state = MENU
-    bird, pipes, enemies, bullets, powerups, gates, ufos, stars, score, last_pipe, last_enemy, last_powerup, last_gate, last_ufo, blobs, last_blob, blob_frequency = reset_game()
-    enemy_frequency = 2000
-    powerup_frequency = 8000
-    font = pygame.font.Font(None, 36)
-    high_score = 0
+    game = Game()
 
     running = True
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    display = Display(render_scale, window_size, fullscreen)
+    screen = display.frame
+    game.screen = screen
     pygame.display.set_caption('Space Flapper')
     clock = pygame.time.Clock()
-    charging_started = False
 
-    # Start playing title music right away in menu
-    title_music.play(-1)  # Loop the music
+    show_profiler = False
+
+    # Sounds stream in while the menu is already showing
+    sound_loader = SoundLoader()
+
+    # Title music is synthesised as it plays; the looped buffer is a fallback
+    music = MusicStream(sound_dispatcher.take_channel())
+    streaming_music = music.play('title')
 
     while running:
+        frame_start = time.perf_counter()
         current_time = pygame.time.get_ticks()
 
-        # Get current level info for background and gap size
-        gap_size, bg_color = get_level_info(score)
+        if not sound_loader.done:
+            loaded = sound_loader.poll()
+            if loaded:
+                assign_sounds(sound_loader.sounds, empty_sound)
+                if 'title_music' in loaded and game.state == MENU and not streaming_music:
+                    # Start playing title music as soon as it is ready
+                    title_music.play(-1)  # Loop the music
 
         # Event handling
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    if game_state == MENU:
-                        game_state = PLAYING
-                    elif game_state == PLAYING:
-                        bird.flap()
-                    elif game_state == GAME_OVER:
-                        bird, pipes, enemies, bullets, powerups, gates, ufos, stars, score, last_pipe, last_enemy, last_powerup, last_gate, last_ufo, blobs, last_blob, blob_frequency = reset_game()
-                        game_state = PLAYING
-                elif event.key == pygame.K_x and game_state == PLAYING:
-                    if bird.weapon.type == WeaponType.CHARGE:
-                        bird.start_charging(current_time)
-                        charging_started = True
-                    elif bird.weapon.type == WeaponType.NUKE and bird.active_nuke:
-                        # Only handle detonation on key press
-                        should_reset, enemies_killed = bird.detonate_nuke(enemies, bullets, screen, ufos, gates, blobs)
-                        score += enemies_killed * 5  # Add 5 points per enemy killed
-                        if should_reset and bird.weapon.ammo <= 0:  # Only reset if out of ammo and after detonation
-                            bird.weapon = Weapon()
-                    else:
-                        # Handle all other weapons including nuke launch
-                        new_bullets, should_reset = bird.shoot(current_time)
-                        bullets.extend(new_bullets)
-                        if should_reset:
-                            bird.weapon = Weapon()
+                if event.key == pygame.K_F3:
+                    show_profiler = not show_profiler
+                elif event.key == pygame.K_SPACE:
+                    if game.state == MENU:
+                        game.state = PLAYING
+                    elif game.state == PLAYING:
+                        game.bird.flap()
+                    elif game.state == GAME_OVER:
+                        game.reset(PLAYING, current_time)
+                elif event.key == pygame.K_d and game.state == MENU:
+                    # Cycle difficulty on the title screen
+                    index = DIFFICULTIES.index(game.difficulty)
+                    game.set_difficulty(DIFFICULTIES[(index + 1) % len(DIFFICULTIES)])
+                    game.reset(MENU, current_time)
+                elif event.key == pygame.K_x and game.state == PLAYING:
+                    game.press_shoot(current_time)
 
             if event.type == pygame.KEYUP:
-                if event.key == pygame.K_x and charging_started:
-                    new_bullets, should_reset = bird.release_charge(current_time)
-                    bullets.extend(new_bullets)
-                    if should_reset:
-                        bird.weapon = Weapon()
-                    charging_started = False
-
-        if game_state == PLAYING:
-            # Get pressed keys
-            keys = pygame.key.get_pressed()
+                if event.key == pygame.K_x:
+                    game.release_shoot(current_time)
 
+        if game.state == PLAYING:
             # Handle shooting
-            if keys[pygame.K_x]:
-                if bird.weapon.type == WeaponType.CHARGE and not charging_started:
-                    bird.start_charging(current_time)
-                    charging_started = True
-                elif not charging_started and bird.weapon.type != WeaponType.NUKE:
-                    new_bullets, should_reset = bird.shoot(current_time)
-                    bullets.extend(new_bullets)
-                    if should_reset:
-                        bird.weapon = Weapon()
-
-            # Update charge weapon
-            if charging_started:
-                bird.update_charge(current_time)
-
-            # Spawn new pipes
-            if current_time - last_pipe > PIPE_FREQUENCY:
-                pipe = Pipe()
-                pipe.gap_size = gap_size // 2  # Half the gap size since we add it both up and down
-                pipe.gap_y = random.randint(pipe.gap_size + 50, SCREEN_HEIGHT - pipe.gap_size - 50)
-                pipes.append(pipe)
-                last_pipe = current_time
-
-            # Spawn new enemies
-            if current_time - last_enemy > enemy_frequency:
-                enemies.append(Enemy())
-                last_enemy = current_time
-
-            # Spawn new powerups
-            powerup, last_powerup = spawn_powerup(last_powerup, current_time)
-            if powerup:
-                powerups.append(powerup)
-
-            # Spawn new gates
-            if current_time - last_gate > 6000:  # Spawn gate every 6 seconds
-                gates.append(Gate())
-                last_gate = current_time
-
-            # Spawn new UFOs
-            if len(ufos) == 0 and score > 5:  # Only spawn after score 5
-                if random.random() < 0.002:  # Reduced from higher value to make UFOs more rare
-                    ufo = UFO(SCREEN_WIDTH + 20, random.randint(50, SCREEN_HEIGHT - 50))
-                    ufos.append(ufo)
-                    ufo_presence_sound.play(-1)  # Loop the sound
-            last_ufo = current_time
-
-            # Spawn new blobs
-            if len(blobs) == 0:  # Only spawn if no blobs exist
-                if current_time - last_blob > blob_frequency:
-                    # Only spawn after score 50 and with 20% chance
-                    if score > 50 and random.random() < 0.2:
-                        blobs.append(TentacleBlob())
-                        last_blob = current_time
-                    else:
-                        last_blob = current_time - blob_frequency * 0.8  # Try again soon if didn't spawn
-
-            # Update
-            bird.update(current_time)
-
-            # Update pipes and check for score
-            for pipe in pipes[:]:
-                pipe.update()
-                if pipe.x + pipe.width < 0:
-                    pipes.remove(pipe)
-                if not pipe.passed and pipe.x < bird.x:
-                    score += 1
-                    pipe.passed = True
-
-            # Update enemies
-            for enemy in enemies[:]:
-                enemy.update()
-                if enemy.x + enemy.size < 0:
-                    enemies.remove(enemy)
-
-            # Update powerups
-            for powerup in powerups[:]:
-                powerup.update()
-                if powerup.x + powerup.size < 0:
-                    powerups.remove(powerup)
-                # Check collision with bird
-                bird_rect = pygame.Rect(bird.x, bird.y, bird.radius*2, bird.radius*2)
-                if bird_rect.colliderect(powerup.get_rect()):
-                    powerup.collect(bird)
-                    powerups.remove(powerup)
-
-            # Update gates
-            for gate in gates[:]:
-                gate.update()
-                if gate.x + gate.width < 0:
-                    gates.remove(gate)
-                elif not gate.destroyed:
-                    # Check collision with bird
-                    if bird.get_rect().colliderect(gate.get_rect()):
-                        if bird.take_hit(current_time):
-                            game_over_sound.play()
-                            ufo_presence_sound.stop()  # Stop UFO sound when player dies
-                            high_score = max(score, high_score)
-                            game_state = GAME_OVER
-
-            # Update UFOs and their bullets
-            for ufo in ufos[:]:
-                ufo.update()
-                if ufo.x + ufo.radius < 0:
-                    ufos.remove(ufo)
-                    if len(ufos) == 0:
-                        ufo_presence_sound.stop()
-
-                # Update UFO bullets and check collisions with player
-                for bullet in ufo.bullets[:]:
-                    bullet.update()
-                    # Remove bullets that go off screen
-                    if bullet.x < 0:
-                        ufo.bullets.remove(bullet)
-                        continue
-
-                    # Check collision with player
-                    bullet_rect = pygame.Rect(bullet.x - 3, bullet.y - 3, 6, 6)  # UFO bullet size
-                    bird_rect = bird.get_rect()
-                    if bullet_rect.colliderect(bird_rect):
-                        if bird.take_hit(current_time):
-                            game_over_sound.play()
-                            ufo_presence_sound.stop()
-                            high_score = max(score, high_score)
-                            game_state = GAME_OVER
-                        ufo.bullets.remove(bullet)
-
-                # Check collision with bird bullets
-                for bullet in bullets[:]:
-                    dx = bullet.x - ufo.x
-                    dy = bullet.y - ufo.y
-                    distance = math.sqrt(dx * dx + dy * dy)
-                    if distance < ufo.radius + 5:
-                        bullets.remove(bullet)
-                        ufo.health -= 1
-                        ufo_hit_sound.play()
-                        if ufo.health <= 0:
-                            ufos.remove(ufo)
-                            score += 10
-                            ufo_death_sound.play()
-                            if len(ufos) == 0:
-                                ufo_presence_sound.stop()
-                            # Spawn powerup
-                            powerup_type = random.choice([PowerUpType.SHIELD, PowerUpType.SPREAD,
-                                                        PowerUpType.LASER, PowerUpType.CHARGE])
-                            powerups.append(PowerUp(powerup_type, ufo.x, ufo.y))
-                            break
-
-            # Check gate collisions
-            for bullet in bullets[:]:
-                for gate in gates:
-                    if not gate.destroyed and bullet.get_rect().colliderect(gate.get_rect()):
-                        if bullet.weapon_type == WeaponType.NUKE and bullet == bird.active_nuke:
-                            # Auto-detonate nuke on gate collision
-                            should_reset, enemies_killed = bird.detonate_nuke(enemies, bullets, screen, ufos, gates, blobs)
-                            score += enemies_killed * 5  # Add points for kills
-                            if should_reset:
-                                bird.weapon = Weapon()
-                            break
-                        else:
-                            # Normal bullet collision
-                            if gate.hit(bullet.damage, current_time):
-                                score += 5  # Bonus points for destroying a gate
-                            if bullet in bullets:
-                                bullets.remove(bullet)
-                            break
-
-                # Check enemy collisions if bullet didn't hit a gate
-                for enemy in enemies[:]:
-                    if bullet.get_rect().colliderect(enemy.get_rect()):
-                        if bullet.weapon_type == WeaponType.NUKE and bullet == bird.active_nuke:
-                            # Auto-detonate nuke on enemy collision
-                            should_reset, enemies_killed = bird.detonate_nuke(enemies, bullets, screen, ufos, gates, blobs)
-                            score += enemies_killed * 5  # Add points for kills
-                            if should_reset:
-                                bird.weapon = Weapon()
-                            break
-                        else:
-                            # Normal bullet collision
-                            enemy_death_sound.play()
-                            score += bullet.damage * 2
-                            if bullet in bullets:
-                                bullets.remove(bullet)
-                            if enemy in enemies:
-                                enemies.remove(enemy)
-                            break
-
-            # Check collisions with pipes
-            for pipe in pipes:
-                if check_collision(bird, pipe):
-                    if bird.take_hit(current_time):
-                        game_over_sound.play()
-                        ufo_presence_sound.stop()
-                        high_score = max(score, high_score)
-                        game_state = GAME_OVER
-
-            # Check collisions with enemies
-            for enemy in enemies[:]:
-                bird_rect = pygame.Rect(bird.x, bird.y, bird.radius*2, bird.radius*2)
-                if bird_rect.colliderect(enemy.get_rect()):
-                    if bird.take_hit(current_time):
-                        game_over_sound.play()
-                        ufo_presence_sound.stop()
-                        high_score = max(score, high_score)
-                        game_state = GAME_OVER
-
-            # Update bullets
-            for bullet in bullets[:]:  # Use slice copy to safely modify list while iterating
-                bullet.update()  # Move bullets
-                # Only remove non-nuke bullets that go off screen
-                if bullet.x > SCREEN_WIDTH and bullet != bird.active_nuke:
-                    bullets.remove(bullet)
-
-            # Update blobs
-            for blob in blobs[:]:
-                blob.update()
+            if pygame.key.get_pressed()[pygame.K_x]:
+                game.hold_shoot(current_time)
 
-                # Check collision with player
-                if bird.get_rect().colliderect(blob.get_rect()):
-                    blob.flash()  # Flash when hitting player
-                    if bird.take_hit(current_time):
-                        game_over_sound.play()
-                        game_state = GAME_OVER
-                    continue
-
-                # Check tentacle collisions with player
-                for tentacle_rect in blob.get_tentacle_rects():
-                    if bird.get_rect().colliderect(tentacle_rect):
-                        blob.flash()  # Flash when hitting player with tentacles
-                        if bird.take_hit(current_time):
-                            game_over_sound.play()
-                            game_state = GAME_OVER
-                        break
-
-                # Check bullet collisions
-                for bullet in bullets[:]:
-                    if bullet.get_rect().colliderect(blob.get_rect()):
-                        blob.flash()  # Flash when hit by bullet
-                        if bullet.weapon_type == WeaponType.NUKE and bullet == bird.active_nuke:
-                            should_reset, enemies_killed = bird.detonate_nuke(enemies, bullets, screen, ufos, gates, blobs)
-                            score += enemies_killed * 5
-                            if should_reset:
-                                bird.weapon = Weapon()
-                        else:
-                            blob.health -= bullet.damage
-                            ufo_hit_sound.play()
-                            if blob.health <= 0:
-                                blobs.remove(blob)
-                                score += 10
-                                ufo_death_sound.play()
-                                # Spawn powerup when blob dies
-                                powerup_type = random.choice([
-                                    PowerUpType.SHIELD,
-                                    PowerUpType.SPREAD,
-                                    PowerUpType.LASER,
-                                    PowerUpType.CHARGE,
-                                    PowerUpType.NUKE  # Include NUKE in blob's drops
-                                ])
-                                powerups.append(PowerUp(powerup_type, blob.x, blob.y))
-                            bullets.remove(bullet)
-                        break
+            game.update(current_time)
 
         # Draw
-        screen.fill(bg_color)  # Use level background color
+        game.update_effects()
+        game.draw(screen, current_time)
+        if show_profiler:
+            draw_profiler(screen, clock)
+        display.present()
 
-        # Draw stars first (before everything else)
-        for star in stars:
-            star.update()
-            star.draw(screen)
-
-        if game_state == MENU:
-            draw_message(screen, "Space Flapper", -80)
-            draw_message(screen, "Press SPACE to Start", -40)
-            draw_message(screen, "X to Shoot, SPACE to Flap", 0)
-        else:
-            # Draw game elements
-            bird.draw(screen, current_time, score)
-            for pipe in pipes:
-                pipe.draw(screen)
-            for enemy in enemies:
-                enemy.draw(screen)
-            for bullet in bullets:
-                    bullet.draw(screen)
-            for powerup in powerups:
-                powerup.draw(screen)
-            for gate in gates:
-                gate.draw(screen, current_time)
-            for ufo in ufos:
-                ufo.draw(screen)
-
-            # Draw blobs
-            for blob in blobs:
-                blob.draw(screen)
-
-            # Draw UI elements last so they're always on top
-            font = pygame.font.Font(None, 36)
-
-            # Draw score in top left
-            score_text = font.render(f'Score: {score}', True, WHITE)
-            screen.blit(score_text, (10, 10))
-
-            # Draw high score in top right
-            high_score_text = font.render(f'High Score: {high_score}', True, WHITE)
-            high_score_rect = high_score_text.get_rect()
-            high_score_rect.topright = (SCREEN_WIDTH - 10, 10)
-            screen.blit(high_score_text, high_score_rect)
-
-            # Draw weapon info if not using default weapon
-            if bird.weapon.type != WeaponType.DEFAULT:
-                font = pygame.font.Font(None, 24)
-                # Draw ammo count
-                ammo_text = f"Ammo: {bird.weapon.ammo}"
-                ammo_surface = font.render(ammo_text, True, WHITE)
-                screen.blit(ammo_surface, (10, 40))
-
-                # Draw weapon type
-                weapon_text = f"Weapon: {bird.weapon.type.name}"
-                weapon_surface = font.render(weapon_text, True, WHITE)
-                screen.blit(weapon_surface, (10, 70))
-
-            if game_state == GAME_OVER:
-                draw_message(screen, "Game Over!", -20)
-                draw_message(screen, "Press SPACE to Play Again", 20)
+        # Start everything the frame asked to play in one go
+        sound_dispatcher.flush()
+        music.pump()
 
         pygame.display.flip()
+        # Time spent on this frame's work, excluding the wait for the next tick
+        governor.record((time.perf_counter() - frame_start) * 1000)
         clock.tick(60)
 
         # Add music handling for game state changes
-        if game_state == PLAYING and pygame.mixer.get_busy():
+        if game.state == PLAYING and pygame.mixer.get_busy():
             title_music.stop()  # Stop title music when game starts
+            music.stop()
 
     pygame.quit()
     sys.exit()
 
+def command_line_scale(args, default=RENDER_SCALE):
+    """The value of a --render-scale=N argument, if there is one"""
+    for arg in args:
+        if arg.startswith('--render-scale='):
+            return float(arg.split('=', 1)[1])
+    return default
+
 if __name__ == "__main__":
-    main()
+    main(render_scale=command_line_scale(sys.argv[1:]), fullscreen='--fullscreen' in sys.argv)
@@ -0,0 +1,292 @@
+"""Small vectorised synthesis engine behind create_sounds.py.
+
+A sound is a Patch: a duration plus a graph of nodes (oscillators,
+envelopes, noise, frequency modulation, filters) combined with + and *.
+Rendering evaluates the graph over the whole timeline at once. Steady
+oscillators, LFOs and decays are expanded per block so that only a few
+hundred transcendental calls are made per sound, and harmonic partials come
+from a recurrence instead of one np.sin per partial.
+"""
+import numpy as np
+
+# Steady tones are built from blocks of this many samples (see steady_sum)
+STEADY_BLOCK = 256
+# Partials on a common ratio step are built by recurrence up to this multiple
+MAX_RECURRENCE = 8
+
+class Context:
+    """The timeline a node is evaluated over; t is always evenly spaced"""
+    def __init__(self, t, sample_rate, rng, endpoint):
+        self.t = t  # Time in seconds of every sample
+        self.n = len(t)
+        self.sample_rate = sample_rate
+        self.rng = rng
+        self.endpoint = endpoint
+        self.t0 = t[0] if len(t) else 0.0
+        self.dt = t[1] - t[0] if len(t) > 1 else 0.0
+
+def steady_sum(omegas, weights, ctx):
+    """Sum of weight * sin(omega * t) over constant angular frequencies.
+
+    With t = t0 + (B*j + i)*dt each term is sin(A_j + b_i), expanded as
+    sin(A)cos(b) + cos(A)sin(b). That needs only n/B + B sines and cosines
+    per frequency instead of n, and the whole sum becomes a single
+    (blocks, 2*partials) x (2*partials, B) matrix product.
+    """
+    blocks = -(-ctx.n // STEADY_BLOCK)
+    coarse = np.multiply.outer(omegas, ctx.t0 + np.arange(blocks) * STEADY_BLOCK * ctx.dt)
+    fine = np.multiply.outer(omegas, np.arange(STEADY_BLOCK) * ctx.dt)
+    weights = np.asarray(weights)[:, None]
+    left = np.concatenate([np.sin(coarse) * weights, np.cos(coarse) * weights])
+    right = np.concatenate([np.cos(fine), np.sin(fine)])
+    return (left.T @ right).reshape(-1)[:ctx.n]
+
+def steady_exp(rate, ctx):
+    """exp(-rate * t), which factors exactly into per-block and in-block terms"""
+    blocks = -(-ctx.n // STEADY_BLOCK)
+    coarse = np.exp(-rate * (ctx.t0 + np.arange(blocks) * STEADY_BLOCK * ctx.dt))[:, None]
+    fine = np.exp(-rate * np.arange(STEADY_BLOCK) * ctx.dt)[None, :]
+    return (coarse * fine).reshape(-1)[:ctx.n]
+
+def recurrence_step(ratios):
+    """A step every ratio is a small integer multiple of, or None"""
+    for divisor in range(1, 5):
+        step = ratios.min() / divisor
+        multiples = ratios / step
+        if np.allclose(multiples, np.round(multiples)) and multiples.max() <= MAX_RECURRENCE:
+            return step
+    return None
+
+def harmonic_sum(phase, ratios, weights):
+    """Sum of weight * sin(ratio * phase) over the partials.
+
+    Ratios on a common step k*s come from the Chebyshev recurrence
+    sin((k+1)x) = 2cos(x)sin(kx) - sin((k-1)x) with x = s*phase, which needs
+    one sine and one cosine in total rather than one sine per ratio.
+    """
+    step = recurrence_step(ratios) if len(ratios) > 2 else None
+    if step is None:
+        return weights @ np.sin(np.multiply.outer(ratios, phase))
+    x = step * phase
+    twice_cos = 2 * np.cos(x)
+    weight_of = dict(zip(np.round(ratios / step).astype(int), weights))
+    previous, current = np.zeros_like(x), np.sin(x)
+    total = weight_of.get(1, 0) * current
+    for k in range(2, max(weight_of) + 1):
+        previous, current = current, twice_cos * current - previous
+        if k in weight_of:
+            total += weight_of[k] * current
+    return total
+
+def value(x, ctx):
+    """Evaluate a node, or pass a plain number through"""
+    return x.render(ctx) if isinstance(x, Node) else x
+
+class Node:
+    def render(self, ctx):
+        raise NotImplementedError
+
+    def __add__(self, other):
+        return Mix(self, other)
+
+    def __radd__(self, other):
+        return Mix(other, self)
+
+    def __sub__(self, other):
+        return Mix(self, Product(-1, other))
+
+    def __rsub__(self, other):
+        return Mix(other, Product(-1, self))
+
+    def __mul__(self, other):
+        return Product(self, other)
+
+    def __rmul__(self, other):
+        return Product(other, self)
+
+class Mix(Node):
+    def __init__(self, *inputs):
+        self.inputs = inputs
+
+    def render(self, ctx):
+        return sum(value(x, ctx) for x in self.inputs)
+
+class Product(Node):
+    def __init__(self, *inputs):
+        self.inputs = inputs
+
+    def render(self, ctx):
+        result = 1
+        for x in self.inputs:
+            result = result * value(x, ctx)
+        return result
+
+class Time(Node):
+    """Seconds since the start of the patch"""
+    def render(self, ctx):
+        return ctx.t
+
+class Line(Node):
+    """Straight line from start to end over the timeline"""
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    def render(self, ctx):
+        return np.linspace(self.start, self.end, ctx.n)
+
+class Osc(Node):
+    """Sine oscillator with optional partials: [(frequency ratio, weight), ...].
+
+    Phase is 2*pi*freq*t, so a changing freq also scales with time as in the
+    original hand-written generators.
+    """
+    def __init__(self, freq, partials=((1, 1.0),)):
+        self.freq = freq
+        self.ratios = np.array([ratio for ratio, _ in partials], dtype=float)
+        self.weights = np.array([weight for _, weight in partials], dtype=float)
+
+    def render(self, ctx):
+        freq = value(self.freq, ctx)
+        if np.ndim(freq) == 0 and ctx.n >= STEADY_BLOCK:
+            return steady_sum(2 * np.pi * freq * self.ratios, self.weights, ctx)
+        phase = 2 * np.pi * freq * ctx.t
+        if len(self.ratios) == 1:
+            return self.weights[0] * np.sin(self.ratios[0] * phase)
+        # Every partial in one batched pass
+        return harmonic_sum(phase, self.ratios, self.weights)
+
+class FM(Node):
+    """Frequency modulated by a sine LFO: base * (1 + depth * sin(2*pi*rate*t))"""
+    def __init__(self, base, rate, depth):
+        self.base = base
+        self.rate = rate
+        self.depth = depth
+
+    def render(self, ctx):
+        if ctx.n >= STEADY_BLOCK:
+            lfo = steady_sum(np.array([2 * np.pi * self.rate]), [1.0], ctx)
+        else:
+            lfo = np.sin(2 * np.pi * self.rate * ctx.t)
+        return value(self.base, ctx) * (1 + lfo * self.depth)
+
+class Exp(Node):
+    """Exponential decay envelope exp(-rate * t)"""
+    def __init__(self, rate):
+        self.rate = rate
+
+    def render(self, ctx):
+        if ctx.n >= STEADY_BLOCK:
+            return steady_exp(self.rate, ctx)
+        return np.exp(-self.rate * ctx.t)
+
+class Fade(Node):
+    """Flat envelope with linear fade in and fade out, lengths in seconds"""
+    def __init__(self, attack=0.0, release=0.0):
+        self.attack = attack
+        self.release = release
+
+    def render(self, ctx):
+        envelope = np.ones(ctx.n)
+        attack = int(self.attack * ctx.sample_rate)
+        release = int(self.release * ctx.sample_rate)
+        if attack:
+            envelope[:attack] = np.linspace(0, 1, attack)
+        if release:
+            envelope[-release:] = np.linspace(1, 0, release)
+        return envelope
+
+class Burst(Node):
+    """Short exponential burst at the start, silent afterwards"""
+    def __init__(self, length, rate):
+        self.length = length
+        self.rate = rate
+
+    def render(self, ctx):
+        envelope = np.zeros(ctx.n)
+        samples = int(self.length * ctx.sample_rate)
+        envelope[:samples] = np.exp(-self.rate * np.linspace(0, 1, samples))
+        return envelope
+
+class Noise(Node):
+    """White noise, 'normal' (scale is the deviation) or 'uniform' (+/- scale)"""
+    def __init__(self, scale=1.0, kind='normal'):
+        self.scale = scale
+        self.kind = kind
+
+    def render(self, ctx):
+        if self.kind == 'uniform':
+            return ctx.rng.uniform(-self.scale, self.scale, ctx.n)
+        return ctx.rng.normal(0, self.scale, ctx.n)
+
+class LowPass(Node):
+    """Windowed-sinc FIR low-pass filter, applied as one convolution"""
+    def __init__(self, input, cutoff, taps=101):
+        self.input = input
+        self.cutoff = cutoff
+        self.taps = taps
+
+    def render(self, ctx):
+        k = np.arange(self.taps) - (self.taps - 1) / 2
+        kernel = np.sinc(2 * self.cutoff / ctx.sample_rate * k) * np.hamming(self.taps)
+        kernel /= kernel.sum()
+        signal = np.broadcast_to(value(self.input, ctx), (ctx.n,))
+        return np.convolve(signal, kernel, mode='same')
+
+class Clip(Node):
+    def __init__(self, input, low=-1.0, high=1.0):
+        self.input = input
+        self.low = low
+        self.high = high
+
+    def render(self, ctx):
+        return np.clip(value(self.input, ctx), self.low, self.high)
+
+class Sequence(Node):
+    """Nodes placed on the timeline: [(start, duration, node), ...].
+
+    With local=True each node sees its own time starting at 0; otherwise it
+    sees the patch time of its slice.
+    """
+    def __init__(self, events, local=True):
+        self.events = events
+        self.local = local
+
+    def render(self, ctx):
+        out = np.zeros(ctx.n)
+        for start, duration, node in self.events:
+            first = int(start * ctx.sample_rate)
+            last = first + int(duration * ctx.sample_rate)
+            if self.local:
+                t = np.linspace(0, duration, last - first, endpoint=ctx.endpoint)
+            else:
+                t = ctx.t[first:last]
+            out[first:last] += value(node, Context(t, ctx.sample_rate, ctx.rng, ctx.endpoint))
+        return out
+
+class Patch:
+    """A complete sound: graph over duration seconds, optionally normalised to
+    peak and clipped to full scale. start offsets the time the graph sees.
+    """
+    def __init__(self, duration, graph, peak=None, clip=False, endpoint=False, start=0.0, seed=None):
+        self.duration = duration
+        self.graph = graph
+        self.peak = peak
+        self.clip = clip
+        self.endpoint = endpoint
+        self.start = start
+        self.seed = seed
+
+def render(patch, sample_rate):
+    """Render a patch to float samples"""
+    n = int(sample_rate * patch.duration)
+    t = np.linspace(0, patch.duration, n, endpoint=patch.endpoint)
+    if patch.start:
+        t = t + patch.start
+    ctx = Context(t, sample_rate, np.random.default_rng(patch.seed), patch.endpoint)
+    audio = np.broadcast_to(value(patch.graph, ctx), (n,)).astype(float)
+    if patch.peak is not None:
+        audio = audio / np.max(np.abs(audio)) * patch.peak
+    if patch.clip:
+        audio = np.clip(audio, -1, 1)
+    return audio